@@ -1,5 +1,5 @@
 from app.loaders.booking import BookInLoader
-from app.loaders.common import ICEDataLoader
+from app.loaders.common import ICEDataLoader, RowBatch
 from app.loaders.disposition import ProcessingDispositionLoader
 from app.loaders.population import AverageDailyPopulationLoader
 from app.loaders.stay import AverageStayLengthLoader
@@ -1,12 +1,47 @@
 from abc import ABC, abstractmethod
 import logging
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional, Sequence
+import numpy as np
 from pandas import DataFrame
 from sqlmodel import SQLModel
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import datetime
 
 from app.models import DetentionStatsReport
+from app.services.fiscal_calendar import fiscal_month
+
+
+class RowBatch:
+    """
+    Loader output as column arrays: one list per model field, all of the
+    same length, for a bulk insert. ``report_id`` is left out and filled in
+    at insert time, so no ORM instance is built per row.
+    """
+
+    __slots__ = ("model", "columns")
+
+    def __init__(self, model: type[SQLModel], columns: Dict[str, list]):
+        self.model = model
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def records(self) -> Iterator[tuple]:
+        """One tuple per row, in ``columns`` order."""
+        return zip(*self.columns.values())
+
+    def params(self, report_id: int) -> list[dict[str, Any]]:
+        """Executemany parameters for a Core ``insert(model.__table__)``."""
+        names = [*self.columns, "report_id"]
+        return [dict(zip(names, (*record, report_id))) for record in self.records()]
+
+    def to_models(self, report: DetentionStatsReport) -> list[SQLModel]:
+        """ORM instances attached to ``report``, as loaders used to return."""
+        names = list(self.columns)
+        return [
+            self.model(report=report, **dict(zip(names, record)))
+            for record in self.records()
+        ]
 
 
 class ICEDataLoader(ABC):
@@ -25,24 +60,143 @@ class ICEDataLoader(ABC):
         self.sheet_skip_rows = sheet_skip_rows
 
     @abstractmethod
-    def load(self, df: DataFrame, report: DetentionStatsReport) -> list[SQLModel]:
+    def rows(self, df: DataFrame, report: DetentionStatsReport) -> RowBatch:
         pass
 
+    def load(self, df: DataFrame, report: DetentionStatsReport) -> list[SQLModel]:
+        """The ORM path: one model instance per row, attached to ``report``."""
+        return self.rows(df, report).to_models(report)
+
 
 def month_end_for_fy(month_abbr: str, pub_date: datetime) -> datetime:
     """
     Convert a fiscal-year month abbreviation (Oct-Sep) into the last day of the
     *calendar* month it belongs to, based on the report’s publication date.
     """
-    month_num = datetime.strptime(month_abbr, "%b").month
+    return fiscal_month(month_abbr, pub_date).month_end
+
+
+def month_flags(
+    columns: Sequence[str], total_column: str, pub_date: datetime
+) -> DataFrame:
+    """
+    Per-report month lookup for the columns of a wide month table (Oct..Sep
+    plus the fiscal-year ``total_column``): the timestamp and range of each
+    column and its incomplete / started flags, for a row scanned from the
+    first column.
 
-    # What year did this fiscal year start?
-    #  - If the report was published Oct-Dec, the FY started this same year.
-    #  - Otherwise (Jan-Sep) it started in the *previous* calendar year.
-    fy_start_year = pub_date.year if pub_date.month >= 10 else pub_date.year - 1
+    Months before the publication month are complete, the publication month
+    is incomplete and stamped with the publication date, later months have
+    not started; the total column covers the fiscal year so far and resets
+    the flags.
+    """
+    pub_month = pub_date.strftime("%b")
+    column = np.array(list(columns), dtype=object)
+    index = np.arange(len(column))
+    is_total = column == total_column
+    is_current = ~is_total & (column == pub_month)
+
+    def last(mask: np.ndarray) -> np.ndarray:
+        """Index of the latest column at or before each one where mask holds."""
+        return np.maximum.accumulate(np.where(mask, index, -1))
+
+    # a total column resets the flags for the columns after it
+    last_total = last(is_total)
+    incomplete = last(is_current) > last_total
+    not_started = last(incomplete & ~is_current) > last_total
+
+    timestamps = [
+        pub_date if at_pub_date else month_end_for_fy(month, pub_date)
+        for month, at_pub_date in zip(column, is_total | is_current)
+    ]
+    return DataFrame(
+        {
+            "column": column,
+            "timestamp": timestamps,
+            "range": np.where(is_total, "fy", "month"),
+            "incomplete": incomplete,
+            "started": ~not_started,
+        },
+        dtype=object,
+    )
+
+
+def melt_months(
+    df: DataFrame,
+    id_columns: Dict[str, Sequence[Any]],
+    value_columns: Sequence[str],
+    total_column: str,
+    pub_date: datetime,
+) -> DataFrame:
+    """
+    Stack a wide month table into one long row per (row, month column), in
+    row order, with the per-row ``id_columns`` repeated alongside the
+    ``timestamp``, ``range``, ``incomplete``, ``started`` and ``value`` of
+    each cell. Every column holds plain Python objects, as ``iterrows`` gave.
+    """
+    value_columns = list(value_columns)
+    n_rows, n_cols = len(df), len(value_columns)
+    names = [*id_columns, "timestamp", "range", "incomplete", "started", "value"]
+    if n_rows == 0 or n_cols == 0:
+        return DataFrame(columns=names, dtype=object)
+
+    lookup = month_flags(value_columns, total_column, pub_date)
+    columns = {
+        name: np.repeat(np.array(list(values), dtype=object), n_cols)
+        for name, values in id_columns.items()
+    }
+    for name in ("timestamp", "range", "incomplete", "started"):
+        columns[name] = np.tile(lookup[name].to_numpy(), n_rows)
+    if value_columns[-1] != total_column:
+        # without a closing total the flags carry over from row to row
+        flags = _scan_flags(value_columns, total_column, pub_date, n_rows)
+        columns["incomplete"] = [incomplete for incomplete, _ in flags]
+        columns["started"] = [started for _, started in flags]
+    # a row-major ravel is the stack; object dtype keeps ints as ints
+    columns["value"] = df[value_columns].to_numpy(dtype=object).ravel()
+    return DataFrame(columns, columns=names, dtype=object)
+
+
+def _scan_flags(
+    columns: list[str], total_column: str, pub_date: datetime, n_rows: int
+) -> list[tuple[bool, bool]]:
+    """(incomplete, started) per cell, carrying the state across rows."""
+    pub_month = pub_date.strftime("%b")
+    incomplete, started = False, True
+    flags = []
+    for _ in range(n_rows):
+        for month in columns:
+            if month == total_column:
+                started, incomplete = True, False
+            elif month == pub_month:
+                incomplete = True
+            elif incomplete and started:
+                started = False
+            flags.append((incomplete, started))
+    return flags
+
+
+def agency_criminality(labels: Sequence[str]) -> tuple[list, list]:
+    """
+    Split the "Agency" labels of the average tables into (agency,
+    criminality) per row: an "<Agency> Average" row opens an agency block
+    and its criminality rows follow it.
+    """
+    agencies, criminalities = [], []
+    current_agency = None
+    for criminality in labels:
+        if "Average" in criminality:
+            parts = criminality.split()
+            if len(parts) == 1:
+                criminality = "Average"
+                current_agency = "Average"
+            else:
+                current_agency, criminality = parts  # two-word form
+        agencies.append(current_agency)
+        criminalities.append(criminality)
+    return agencies, criminalities
 
-    # Oct-Dec belong to the FY’s *start* year, the rest to start_year+1
-    year = fy_start_year if month_num >= 10 else fy_start_year + 1
 
-    first_day = datetime(year, month_num, 1)
-    return first_day + relativedelta(months=1) - timedelta(days=1)
+def month_counts(df: DataFrame) -> DataFrame:
+    """Month columns as whole counts, blank cells counted as 0."""
+    return df.astype("float64").fillna(0).astype("int64")
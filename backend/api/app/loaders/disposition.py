@@ -1,6 +1,5 @@
 from pandas import DataFrame
-from sqlmodel import SQLModel
-from app.loaders.common import ICEDataLoader
+from app.loaders.common import ICEDataLoader, RowBatch
 from app.models import ProcessingDisposition, DetentionStatsReport
 
 
@@ -12,22 +11,21 @@ class ProcessingDispositionLoader(ICEDataLoader):
             sheet_name=f"Detention FY{fy[-2:]}",
         )
 
-    def load(self, df: DataFrame, report: DetentionStatsReport) -> list[SQLModel]:
-        items: list[SQLModel] = []
-
-        for _, row in df.iterrows():
-            disposition = row["Processing Disposition"]
-
-            for facility in df.columns[1:]:
-                population = int(row[facility])
-
-                items.append(
-                    ProcessingDisposition(
-                        report=report,
-                        disposition=disposition,
-                        facility=facility,
-                        population=population,
-                    )
-                )
-
-        return items
+    def rows(self, df: DataFrame, report: DetentionStatsReport) -> RowBatch:
+        facilities = df.columns[1:]
+        n_facilities = len(facilities)
+        return RowBatch(
+            ProcessingDisposition,
+            {
+                "disposition": [
+                    disposition
+                    for disposition in df["Processing Disposition"]
+                    for _ in range(n_facilities)
+                ],
+                "facility": list(facilities) * len(df),
+                "population": [
+                    int(population)
+                    for population in df[facilities].to_numpy(dtype=object).ravel()
+                ],
+            },
+        )
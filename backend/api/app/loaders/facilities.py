@@ -1,9 +1,8 @@
 from datetime import datetime, timedelta
 import math
 from pandas import DataFrame
-from sqlmodel import SQLModel
 
-from app.loaders.common import ICEDataLoader
+from app.loaders.common import ICEDataLoader, RowBatch
 from app.models import DetentionStatsReport, Facility
 
 
@@ -40,47 +39,46 @@ class FacilitiesLoader(ICEDataLoader):
         )
         self.fy = fy
 
-    def load(self, df: DataFrame, report: DetentionStatsReport) -> list[SQLModel]:
-        items: list[SQLModel] = []
+    def rows(self, df: DataFrame, report: DetentionStatsReport) -> RowBatch:
+        def floats(column: str) -> list:
+            return [_to_float(value) for value in df[column]]
 
-        for _, row in df.iterrows():
-            alos = _to_float(row[f"FY{self.fy[-2:]} ALOS"])
-            if alos is None:
-                alos = 0
-            items.append(
-                Facility(
-                    report=report,
-                    name=row["Name"],
-                    address=row["Address"],
-                    city=row["City"],
-                    state=row["State"],
-                    zip_code=str(row["Zip"]),
-                    aor=row["AOR"],
-                    type_detailed=row["Type Detailed"],
-                    gender=row["Male/Female"],
-                    fy25_alos=alos,
-                    level_a=_to_float(row["Level A"]),
-                    level_b=_to_float(row["Level B"]),
-                    level_c=_to_float(row["Level C"]),
-                    level_d=_to_float(row["Level D"]),
-                    male_crim=_to_float(row["Male Crim"]),
-                    male_non_crim=_to_float(row["Male Non-Crim"]),
-                    female_crim=_to_float(row["Female Crim"]),
-                    female_non_crim=_to_float(row["Female Non-Crim"]),
-                    ice_threat_level_1=_to_float(row["ICE Threat Level 1"]),
-                    ice_threat_level_2=_to_float(row["ICE Threat Level 2"]),
-                    ice_threat_level_3=_to_float(row["ICE Threat Level 3"]),
-                    no_ice_threat_level=_to_float(row["No ICE Threat Level"]),
-                    mandatory=_to_float(row["Mandatory"]),
-                    guaranteed_minimum=_to_float(row["Guaranteed Minimum"]),
-                    last_inspection_type=row["Last Inspection Type"],
-                    last_inspection_end_date=_excel_to_datetime(
-                        row["Last Inspection End Date"]
-                    ),
-                    # pending_fy25_inspection=row[f"Pending FY{self.fy[-2:]} Inspection"],
-                    last_inspection_standard=row["Last Inspection Standard"],
-                    last_final_rating=row["Last Final Rating"],
-                )
-            )
-
-        return items
+        return RowBatch(
+            Facility,
+            {
+                "name": df["Name"].tolist(),
+                "address": df["Address"].tolist(),
+                "city": df["City"].tolist(),
+                "state": df["State"].tolist(),
+                "zip_code": [str(value) for value in df["Zip"]],
+                "aor": df["AOR"].tolist(),
+                "type_detailed": df["Type Detailed"].tolist(),
+                "gender": df["Male/Female"].tolist(),
+                "fy25_alos": [
+                    0 if alos is None else alos
+                    for alos in floats(f"FY{self.fy[-2:]} ALOS")
+                ],
+                "level_a": floats("Level A"),
+                "level_b": floats("Level B"),
+                "level_c": floats("Level C"),
+                "level_d": floats("Level D"),
+                "male_crim": floats("Male Crim"),
+                "male_non_crim": floats("Male Non-Crim"),
+                "female_crim": floats("Female Crim"),
+                "female_non_crim": floats("Female Non-Crim"),
+                "ice_threat_level_1": floats("ICE Threat Level 1"),
+                "ice_threat_level_2": floats("ICE Threat Level 2"),
+                "ice_threat_level_3": floats("ICE Threat Level 3"),
+                "no_ice_threat_level": floats("No ICE Threat Level"),
+                "mandatory": floats("Mandatory"),
+                "guaranteed_minimum": floats("Guaranteed Minimum"),
+                "last_inspection_type": df["Last Inspection Type"].tolist(),
+                "last_inspection_end_date": [
+                    _excel_to_datetime(value)
+                    for value in df["Last Inspection End Date"]
+                ],
+                # "pending_fy25_inspection": df[f"Pending FY{self.fy[-2:]} Inspection"],
+                "last_inspection_standard": df["Last Inspection Standard"].tolist(),
+                "last_final_rating": df["Last Final Rating"].tolist(),
+            },
+        )
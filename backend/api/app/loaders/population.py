@@ -1,6 +1,10 @@
 from pandas import DataFrame
-from sqlmodel import SQLModel
-from app.loaders.common import ICEDataLoader, month_end_for_fy
+from app.loaders.common import (
+    ICEDataLoader,
+    RowBatch,
+    agency_criminality,
+    melt_months,
+)
 from app.models import AverageDailyPopulation, DetentionStatsReport
 
 
@@ -12,54 +16,24 @@ class AverageDailyPopulationLoader(ICEDataLoader):
             sheet_name=f"Detention FY{fy[-2:]}",
         )
 
-    def load(self, df: DataFrame, report: DetentionStatsReport) -> list[SQLModel]:
-        items: list[SQLModel] = []
-
-        pub_month = report.publication_date.strftime("%b")
-        incomplete = False  # becomes True once we hit pub_month
-        started = True  # becomes False once we *pass* pub_month
-        current_agency = None
-
-        for _, row in df.iterrows():
-            criminality = row["Agency"]
-            if "Average" in criminality:
-                parts = criminality.split()
-                if len(parts) == 1:
-                    criminality = "Average"
-                    current_agency = "Average"
-                else:
-                    current_agency, criminality = parts  # two-word form
-
-            for month in df.columns[1:]:
-                population = row[month]
-                stat_range = "month"
-
-                if month == "FY Overall":
-                    timestamp = report.publication_date
-                    stat_range = "fy"
-                    started = True
-                    incomplete = False
-                elif month == pub_month:
-                    timestamp = report.publication_date  # reporting month ⇒ exact date
-                    incomplete = True
-                else:
-                    timestamp = month_end_for_fy(month, report.publication_date)
-
-                    # keep the started / incomplete flags in sync
-                    if incomplete and started:
-                        started = False
-
-                items.append(
-                    AverageDailyPopulation(
-                        report=report,
-                        timestamp=timestamp,
-                        agency=current_agency,
-                        criminality=criminality,
-                        population=round(population, 2),
-                        incomplete=incomplete,
-                        started=started,
-                        range=stat_range,
-                    )
-                )
-
-        return items
+    def rows(self, df: DataFrame, report: DetentionStatsReport) -> RowBatch:
+        agencies, criminalities = agency_criminality(df["Agency"])
+        long = melt_months(
+            df,
+            {"agency": agencies, "criminality": criminalities},
+            df.columns[1:],
+            "FY Overall",
+            report.publication_date,
+        )
+        return RowBatch(
+            AverageDailyPopulation,
+            {
+                "timestamp": long["timestamp"].tolist(),
+                "agency": long["agency"].tolist(),
+                "criminality": long["criminality"].tolist(),
+                "population": [round(value, 2) for value in long["value"]],
+                "incomplete": long["incomplete"].tolist(),
+                "started": long["started"].tolist(),
+                "range": long["range"].tolist(),
+            },
+        )
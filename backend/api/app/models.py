@@ -3,7 +3,7 @@ from typing import Any, Optional
 from datetime import datetime, date
 from uuid import UUID
 from sqlmodel import Relationship, SQLModel, Field
-from sqlalchemy import func
+from sqlalchemy import Index, func
 
 
 def uuid():
@@ -78,21 +78,26 @@ class DetentionStatsReport(BaseDetentionStatsReport, table=True):
 
     average_daily_populations: list["AverageDailyPopulation"] = Relationship(
         back_populates="report",
+        sa_relationship_kwargs={"foreign_keys": "[AverageDailyPopulation.report_id]"},
     )
     average_stay_lengths: list["AverageStayLength"] = Relationship(
         back_populates="report",
+        sa_relationship_kwargs={"foreign_keys": "[AverageStayLength.report_id]"},
     )
     book_out_releases: list["BookOutRelease"] = Relationship(
         back_populates="report",
+        sa_relationship_kwargs={"foreign_keys": "[BookOutRelease.report_id]"},
     )
     book_ins: list["BookIn"] = Relationship(
         back_populates="report",
+        sa_relationship_kwargs={"foreign_keys": "[BookIn.report_id]"},
     )
     processing_dispositions: list["ProcessingDisposition"] = Relationship(
         back_populates="report",
     )
     facilities: list["Facility"] = Relationship(
         back_populates="report",
+        sa_relationship_kwargs={"foreign_keys": "[Facility.report_id]"},
     )
 
 
@@ -108,14 +113,34 @@ class BaseAverageDailyPopulation(SQLModel):
 
 class AverageDailyPopulation(BaseAverageDailyPopulation, table=True):
     __tablename__ = "average_daily_population"
+    # natural key + report, for the merged_* subqueries
+    __table_args__ = (
+        Index(
+            "ix_average_daily_population_natural_key",
+            "timestamp",
+            "agency",
+            "criminality",
+            "report_id",
+        ),
+    )
     id: Optional[int] = Field(primary_key=True)
     uuid: Optional[UUID] = uuid()
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     report_id: int = Field(
         foreign_key="detention_stats_reports.id", index=True
     )
+    # newest report that carried this value unchanged (delta ingestion)
+    confirmed_report_id: Optional[int] = Field(
+        default=None,
+        foreign_key="detention_stats_reports.id",
+        index=True,
+        ondelete="SET NULL",
+    )
+    # hash of the content fields, see app/utils/digest.py
+    row_digest: Optional[str] = Field(default=None, max_length=32)
     report: DetentionStatsReport = Relationship(
-        back_populates="average_daily_populations"
+        back_populates="average_daily_populations",
+        sa_relationship_kwargs={"foreign_keys": "[AverageDailyPopulation.report_id]"},
     )
 
 
@@ -131,14 +156,34 @@ class BaseAverageStayLength(SQLModel):
 
 class AverageStayLength(BaseAverageStayLength, table=True):
     __tablename__ = "average_stay_length"
+    # natural key + report, for the merged_* subqueries
+    __table_args__ = (
+        Index(
+            "ix_average_stay_length_natural_key",
+            "timestamp",
+            "agency",
+            "criminality",
+            "report_id",
+        ),
+    )
     id: Optional[int] = Field(primary_key=True)
     uuid: Optional[UUID] = uuid()
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     report_id: int = Field(
         foreign_key="detention_stats_reports.id", index=True
     )
+    # newest report that carried this value unchanged (delta ingestion)
+    confirmed_report_id: Optional[int] = Field(
+        default=None,
+        foreign_key="detention_stats_reports.id",
+        index=True,
+        ondelete="SET NULL",
+    )
+    # hash of the content fields, see app/utils/digest.py
+    row_digest: Optional[str] = Field(default=None, max_length=32)
     report: DetentionStatsReport = Relationship(
-        back_populates="average_stay_lengths"
+        back_populates="average_stay_lengths",
+        sa_relationship_kwargs={"foreign_keys": "[AverageStayLength.report_id]"},
     )
 
 
@@ -154,14 +199,34 @@ class BaseBookOutRelease(SQLModel):
 
 class BookOutRelease(BaseBookOutRelease, table=True):
     __tablename__ = "book_out_release"
+    # natural key + report, for the merged_* subqueries
+    __table_args__ = (
+        Index(
+            "ix_book_out_release_natural_key",
+            "timestamp",
+            "reason",
+            "criminality",
+            "report_id",
+        ),
+    )
     id: Optional[int] = Field(primary_key=True)
     uuid: Optional[UUID] = uuid()
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     report_id: int = Field(
         foreign_key="detention_stats_reports.id", index=True
     )
+    # newest report that carried this value unchanged (delta ingestion)
+    confirmed_report_id: Optional[int] = Field(
+        default=None,
+        foreign_key="detention_stats_reports.id",
+        index=True,
+        ondelete="SET NULL",
+    )
+    # hash of the content fields, see app/utils/digest.py
+    row_digest: Optional[str] = Field(default=None, max_length=32)
     report: DetentionStatsReport = Relationship(
-        back_populates="book_out_releases"
+        back_populates="book_out_releases",
+        sa_relationship_kwargs={"foreign_keys": "[BookOutRelease.report_id]"},
     )
 
 
@@ -176,13 +241,34 @@ class BaseBookIn(SQLModel):
 
 class BookIn(BaseBookIn, table=True):
     __tablename__ = "book_in"
+    # natural key + report, for the merged_* subqueries
+    __table_args__ = (
+        Index(
+            "ix_book_in_natural_key",
+            "timestamp",
+            "agency",
+            "report_id",
+        ),
+    )
     id: Optional[int] = Field(primary_key=True)
     uuid: Optional[UUID] = uuid()
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     report_id: int = Field(
         foreign_key="detention_stats_reports.id", index=True
     )
-    report: DetentionStatsReport = Relationship(back_populates="book_ins")
+    # newest report that carried this value unchanged (delta ingestion)
+    confirmed_report_id: Optional[int] = Field(
+        default=None,
+        foreign_key="detention_stats_reports.id",
+        index=True,
+        ondelete="SET NULL",
+    )
+    # hash of the content fields, see app/utils/digest.py
+    row_digest: Optional[str] = Field(default=None, max_length=32)
+    report: DetentionStatsReport = Relationship(
+        back_populates="book_ins",
+        sa_relationship_kwargs={"foreign_keys": "[BookIn.report_id]"},
+    )
 
 
 class BaseProcessingDisposition(SQLModel):
@@ -241,13 +327,43 @@ class BaseFacility(SQLModel):
 
 class Facility(BaseFacility, table=True):
     __tablename__ = "facilities"
+    # natural key + report, for the merged_* subqueries
+    __table_args__ = (Index("ix_facilities_natural_key", "name", "report_id"),)
     id: Optional[int] = Field(primary_key=True)
     uuid: Optional[UUID] = uuid()
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     report_id: int = Field(
         foreign_key="detention_stats_reports.id", index=True
     )
-    report: DetentionStatsReport = Relationship(back_populates="facilities")
+    # newest report that carried this value unchanged (delta ingestion)
+    confirmed_report_id: Optional[int] = Field(
+        default=None,
+        foreign_key="detention_stats_reports.id",
+        index=True,
+        ondelete="SET NULL",
+    )
+    # hash of the content fields, see app/utils/digest.py
+    row_digest: Optional[str] = Field(default=None, max_length=32)
+    report: DetentionStatsReport = Relationship(
+        back_populates="facilities",
+        sa_relationship_kwargs={"foreign_keys": "[Facility.report_id]"},
+    )
+
+
+# fiscal calendar dimension (see app/services/fiscal_calendar.py)
+class BaseFiscalCalendar(SQLModel):
+    fiscal_year: int = Field(index=True)  # 2025 for Oct 2024 - Sep 2025
+    fiscal_month: int = Field(index=True)  # 1 (Oct) .. 12 (Sep)
+    quarter: int = Field(index=True)  # fiscal quarter, 1 (Oct-Dec) .. 4
+    month_abbr: str = Field(index=True)  # Oct, Nov, etc.
+    month_start: datetime = Field(index=True)
+    # the timestamp of a complete month's rows in the fact tables
+    month_end: datetime = Field(unique=True, index=True)
+
+
+class FiscalCalendar(BaseFiscalCalendar, table=True):
+    __tablename__ = "fiscal_calendar"
+    id: Optional[int] = Field(primary_key=True)
 
 
 class AverageDailyPopulationRead(BaseAverageDailyPopulation):
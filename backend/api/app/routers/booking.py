@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, Request, Response
-from sqlmodel import select
 from app.db import get_session
 from app.limits import limiter
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -9,7 +8,7 @@ from app.models import (
     BookInRead,
 )
 from app.utils.cache import cache_headers
-from app.services.reports import merged_booking_subquery
+from app.services.reports import merged_current_query
 
 
 router = APIRouter(
@@ -26,8 +25,7 @@ async def current(
     response: Response,
     session: AsyncSession = Depends(get_session),
 ) -> list[BookInRead]:
-    sub_query = merged_booking_subquery()
-    query = select(BookIn).where(BookIn.id.in_(select(sub_query.c.id)))
+    query = merged_current_query(BookIn)
     results = await session.exec(query)
     items = results.all()
 
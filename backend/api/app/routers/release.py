@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, Request, Response
-from sqlmodel import select
 from app.db import get_session
 from app.limits import limiter
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -9,7 +8,7 @@ from app.models import (
     BookOutReleaseRead,
 )
 from app.utils.cache import cache_headers
-from app.services.reports import merged_release_subquery
+from app.services.reports import merged_current_query
 
 
 router = APIRouter(
@@ -26,10 +25,7 @@ async def current(
     response: Response,
     session: AsyncSession = Depends(get_session),
 ) -> list[BookOutReleaseRead]:
-    sub_query = merged_release_subquery()
-    query = select(BookOutRelease).where(
-        BookOutRelease.id.in_(select(sub_query.c.id))
-    )
+    query = merged_current_query(BookOutRelease)
     results = await session.exec(query)
     items = results.all()
     response.headers.update(cache_headers(max_age=60 * 60 * 24))
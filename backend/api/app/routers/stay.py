@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, Request, Response
-from sqlmodel import select
 from app.db import get_session
 from app.limits import limiter
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -9,7 +8,7 @@ from app.models import (
     AverageStayLengthRead,
 )
 from app.utils.cache import cache_headers
-from app.services.reports import merged_stay_subquery
+from app.services.reports import merged_current_query
 
 
 router = APIRouter(
@@ -26,10 +25,7 @@ async def current(
     response: Response,
     session: AsyncSession = Depends(get_session),
 ) -> list[AverageStayLengthRead]:
-    sub_query = merged_stay_subquery()
-    query = select(AverageStayLength).where(
-        AverageStayLength.id.in_(select(sub_query.c.id))
-    )
+    query = merged_current_query(AverageStayLength)
     results = await session.exec(query)
     items = results.all()
     response.headers.update(cache_headers(max_age=60 * 60 * 24))
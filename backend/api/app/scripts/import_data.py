@@ -1,29 +1,43 @@
 import asyncio
 import argparse
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import httpx
+import json
 import logging
 import os
+from pathlib import Path
+import time
 from dotenv import load_dotenv
+from pandas import DataFrame
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db import init_db, session_context
-from app.loaders import get_loaders
+from app.loaders import ICEDataLoader, get_loaders
 from app.models import DetentionStatsReport
-from app.services.excel import convert_to_df_dict, extract_tables
-from app.loaders.common import ICEDataLoader
+from app.services.excel import (
+    EXTRACT_WORKERS,
+    Tables,
+    convert_to_df_dict,
+    extract_sheets,
+    extract_workbook,
+)
+from app.services.fiscal_calendar import ensure_fiscal_year, fiscal_year_of
+from app.services.ingest import IMPORT_INSERT_MODE, INSERT_MODES, insert_batch
+from app.services.reports import refresh_merged_views
+from app.utils.tracing import Tracer, span, traced_call, tracing
 
 
 logger = logging.getLogger("openice.import-data")
 logger.setLevel(logging.INFO)
 
+# (sheet name, skip rows): one extraction serves every loader reading it
+Source = tuple[str, tuple[int, ...]]
 
-async def import_data(file_path: str, session: AsyncSession):
-    logger.info("Extracting tables...")
-    with open(file_path, "rb") as file:
-        raw_bytes = file.read()
 
+def parse_report_name(file_path: str | Path) -> tuple[str, datetime]:
+    """Fiscal year and publication date of e.g. FY25_detentionStats06202025.xlsx."""
     source_name = os.path.basename(file_path)
     file_name, file_extension = os.path.splitext(source_name)
     start_part, end_part = file_name.split("_")
@@ -37,69 +51,283 @@ async def import_data(file_path: str, session: AsyncSession):
 
     # grab last 8 characters
     date_part = end_part[-8:]
-    report_date = datetime.strptime(date_part, "%m%d%Y")
-    publication_month = report_date.strftime("%b")
-    publication_year = report_date.year
+    return fiscal_year, datetime.strptime(date_part, "%m%d%Y")
 
-    report = DetentionStatsReport(
-        source_name=source_name,
+
+def build_report(file_path: str | Path, raw_bytes: bytes) -> DetentionStatsReport:
+    """Report row for a workbook named like FY25_detentionStats06202025.xlsx."""
+    fiscal_year, report_date = parse_report_name(file_path)
+    return DetentionStatsReport(
+        source_name=os.path.basename(file_path),
         fiscal_year=fiscal_year,
         publication_date=report_date,
-        publication_month=publication_month,
-        publication_year=publication_year,
+        publication_month=report_date.strftime("%b"),
+        publication_year=report_date.year,
         raw_bytes=raw_bytes,
     )
-    session.add(report)
 
-    all_loaders = get_loaders(fiscal_year)
-    # group loaders by sheet name
-    loaders_by_sheet: dict[str, list[ICEDataLoader]] = defaultdict(list)
-    for loader in all_loaders:
-        loaders_by_sheet[loader.sheet_name].append(loader)
-
-    for sheet_name, sheet_loaders in loaders_by_sheet.items():
-        logger.info(f"Processing {sheet_name}...")
-        loader_skip_rows: list[int] = []
-        for loader in sheet_loaders:
-            loader_skip_rows.extend(loader.sheet_skip_rows or [])
-        tables = extract_tables(
-            file_path,
+
+def table_requests(loaders: list[ICEDataLoader]) -> dict[Source, set[str]]:
+    """
+    One extraction per sheet and skip-row mask, asking only for the tables
+    its loaders read.
+    """
+    titles_by_source: dict[Source, set[str]] = defaultdict(set)
+    for loader in loaders:
+        source = (loader.sheet_name, tuple(loader.sheet_skip_rows or ()))
+        titles_by_source[source].add(loader.title)
+    return titles_by_source
+
+
+def extraction_requests(titles_by_source: dict[Source, set[str]]) -> list[dict]:
+    return [
+        dict(
             sheet_name=sheet_name,
-            sheet_skip_rows=None if not loader_skip_rows else loader_skip_rows,
+            sheet_skip_rows=list(skip_rows) or None,
+            titles=sorted(titles),
+            columnar=True,
         )
-        data = convert_to_df_dict(tables)
+        for (sheet_name, skip_rows), titles in titles_by_source.items()
+    ]
+
+
+def extract_report(file_path: str | Path, use_cache: bool = True) -> list[Tables]:
+    """Every table a report's loaders need, extracted in this process."""
+    fiscal_year, _ = parse_report_name(file_path)
+    titles_by_source = table_requests(get_loaders(fiscal_year))
+    return extract_workbook(
+        file_path, extraction_requests(titles_by_source), use_cache=use_cache
+    )
 
+
+async def load_report(
+    report: DetentionStatsReport,
+    results: list[Tables],
+    session: AsyncSession,
+    insert_mode: str = IMPORT_INSERT_MODE,
+) -> int:
+    """Run every loader over the extracted tables; returns the rows added."""
+    all_loaders = get_loaders(report.fiscal_year)
+    titles_by_source = table_requests(all_loaders)
+    session.add(report)
+    # months for fiscal year / quarter joins of the rows below
+    await ensure_fiscal_year(session, fiscal_year_of(report.publication_date))
+
+    data_by_source: dict[Source, dict[str, DataFrame]] = {}
+    for source, tables in zip(titles_by_source, results):
+        data_by_source[source] = convert_to_df_dict(tables)
         logger.info(
-            f"Found {len(data)} tables in {sheet_name}, processing with {len(sheet_loaders)} loaders..."
+            f"Found {len(tables)}/{len(titles_by_source[source])} tables in {source[0]}"
         )
-        for loader in sheet_loaders:
-            logger.info(f"Loading {loader.name}...")
-            df = data[loader.title]
-            items = loader.load(df, report)
-            session.add_all(items)
-            await session.commit()
-            for item in items:
-                await session.refresh(item)
-            logger.info(f"Loaded {len(items)} items for {loader.name}")
-        logger.info(f"Completed {sheet_name}")
+
+    total = 0
+    for loader in all_loaders:
+        logger.info(f"Loading {loader.name}...")
+        source = (loader.sheet_name, tuple(loader.sheet_skip_rows or ()))
+        df = data_by_source[source][loader.title]
+        with span("load", loader=loader.name) as s:
+            batch = loader.rows(df, report)
+            s.rows = len(batch)
+        with span("insert", loader=loader.name, mode=insert_mode) as s:
+            written = await insert_batch(session, batch, report, insert_mode)
+            s.rows = written
+        if insert_mode == "orm":
+            # the flush's INSERT .. RETURNING fills in ids and uuids
+            with span("commit", loader=loader.name) as s:
+                await session.commit()
+                s.rows = written
+        total += written
+        logger.info(f"Loaded {len(batch)} items for {loader.name}, wrote {written}")
+
+    # the merged views the /current endpoints read switch over on commit,
+    # with the report and all its rows unless "orm" committed them already
+    with span("refresh"):
+        await refresh_merged_views(session)
+    with span("commit") as s:
+        await session.commit()
+        s.rows = 0 if insert_mode == "orm" else total
+    return total
+
+
+def log_summary(
+    file_path: str | Path, rows: int, tracer: Tracer, trace_dir: str | None = None
+) -> None:
+    """One JSON line of phase timings per report, plus its trace events."""
+    source_name = os.path.basename(file_path)
+    summary = {"report": source_name, "rows": rows, **tracer.summary()}
+    logger.info(f"Import summary: {json.dumps(summary)}")
+    if trace_dir is not None:
+        os.makedirs(trace_dir, exist_ok=True)
+        tracer.write_trace(Path(trace_dir) / f"{Path(source_name).stem}.trace.json")
+
+
+async def import_data(
+    file_path: str,
+    session: AsyncSession,
+    workers: int = EXTRACT_WORKERS,
+    trace_dir: str | None = None,
+    insert_mode: str = IMPORT_INSERT_MODE,
+) -> int:
+    with tracing() as tracer:
+        logger.info("Extracting tables...")
+        with open(file_path, "rb") as file:
+            raw_bytes = file.read()
+
+        report = build_report(file_path, raw_bytes)
+        titles_by_source = table_requests(get_loaders(report.fiscal_year))
+        # independent sheet extractions run in parallel processes
+        logger.info(f"Extracting {len(titles_by_source)} sheets...")
+        with span("extract", sheets=len(titles_by_source)):
+            results = await extract_sheets(
+                raw_bytes, extraction_requests(titles_by_source), workers=workers
+            )
+        total = await load_report(report, results, session, insert_mode)
     logger.info("Data import completed")
+    log_summary(file_path, total, tracer, trace_dir)
+    return total
+
+
+def find_reports(directory: str, pattern: str = "*.xlsx") -> list[Path]:
+    """Workbooks in ``directory`` matching ``pattern``, oldest report first."""
+    reports = []
+    for path in Path(directory).glob(pattern):
+        try:
+            reports.append((parse_report_name(path)[1], path))
+        except ValueError:
+            logger.warning(f"Skipping {path.name}: not a detention stats report name")
+    return [path for _, path in sorted(reports)]
+
+
+async def import_directory(
+    file_paths: list[Path],
+    workers: int = EXTRACT_WORKERS,
+    trace_dir: str | None = None,
+    insert_mode: str = IMPORT_INSERT_MODE,
+) -> int:
+    """
+    Backfill many reports: whole workbooks are extracted in parallel worker
+    processes while the reports already extracted are loaded, in publication
+    order, through the shared connection pool.
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    total = 0
+    failed: list[str] = []
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(file_paths)))) as pool:
+        tracers = [Tracer() for _ in file_paths]
+        extractions = [
+            loop.run_in_executor(pool, traced_call, extract_report, path)
+            for path in file_paths
+        ]
+        for i, (path, extraction, tracer) in enumerate(
+            zip(file_paths, extractions, tracers), start=1
+        ):
+            try:
+                results, spans = await extraction
+                tracer.extend(spans)
+                with tracing(tracer):
+                    report = build_report(path, path.read_bytes())
+                    async with session_context() as session:
+                        rows = await load_report(
+                            report, results, session, insert_mode
+                        )
+            except Exception as e:
+                logger.exception(f"[{i}/{len(file_paths)}] {path.name} failed: {e}")
+                failed.append(path.name)
+                continue
+            total += rows
+            log_summary(path, rows, tracer, trace_dir)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"[{i}/{len(file_paths)}] {path.name}: {rows} rows "
+                f"({elapsed:.1f}s elapsed)"
+            )
+
+    elapsed = time.perf_counter() - started
+    loaded = len(file_paths) - len(failed)
+    logger.info(
+        f"Imported {loaded}/{len(file_paths)} reports, {total} rows in {elapsed:.1f}s "
+        f"({total / elapsed if elapsed else 0:.0f} rows/s, "
+        f"{loaded / elapsed if elapsed else 0:.2f} reports/s)"
+    )
+    if failed:
+        logger.error(f"Failed reports: {', '.join(failed)}")
+    return total
 
 
-async def main(file_path: str):
+async def main(
+    file_path: str | None,
+    directory: str | None,
+    pattern: str,
+    workers: int,
+    trace_dir: str | None,
+    insert_mode: str,
+):
     logger.info("Initializing database...")
     await init_db()
+    if directory is not None:
+        file_paths = find_reports(directory, pattern)
+        logger.info(f"Found {len(file_paths)} reports in {directory}")
+        await import_directory(
+            file_paths, workers=workers, trace_dir=trace_dir, insert_mode=insert_mode
+        )
+        return
     async with session_context() as session:
-        await import_data(file_path, session)
+        await import_data(
+            file_path,
+            session,
+            workers=workers,
+            trace_dir=trace_dir,
+            insert_mode=insert_mode,
+        )
 
 
 if __name__ == "__main__":
     load_dotenv()
     parser = argparse.ArgumentParser()
-    parser.add_argument("--file_path", type=str, required=True)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--file_path", type=str)
+    target.add_argument(
+        "--dir", type=str, help="import every report in this directory"
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        default="*.xlsx",
+        help="pattern for the reports to pick up with --dir",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=EXTRACT_WORKERS,
+        help="processes for extraction (sheets of one file, or whole files "
+        "with --dir), 1 to extract serially",
+    )
+    parser.add_argument(
+        "--trace_dir",
+        type=str,
+        help="write Chrome trace events (chrome://tracing, Perfetto) per report",
+    )
+    parser.add_argument(
+        "--insert_mode",
+        choices=INSERT_MODES,
+        default=IMPORT_INSERT_MODE,
+        help="copy: COPY plain rows, core: bulk INSERT of them, "
+        "orm: one model instance per row, delta: only new or revised values",
+    )
     args = parser.parse_args()
 
     logger.info("Starting data import...")
     try:
-        asyncio.run(main(args.file_path))
+        asyncio.run(
+            main(
+                args.file_path,
+                args.dir,
+                args.glob,
+                args.workers,
+                args.trace_dir,
+                args.insert_mode,
+            )
+        )
     except KeyboardInterrupt:
         logger.info("Data import stopped.")
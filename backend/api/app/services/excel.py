@@ -1,10 +1,45 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
 from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 from openpyxl.utils.cell import column_index_from_string
 from openpyxl.worksheet.merge import CellRange
-from pandas import DataFrame
+from openpyxl.xml.constants import SHEET_MAIN_NS
+import numpy as np
+from pandas import DataFrame, Series, to_numeric
+from pandas.api.types import infer_dtype
+
+from app.services.spreadsheetml import XlsxReader
+from app.services.table_cache import TableCache, get_table_cache, workbook_digest
+from app.services.table_layout import LayoutStore, SheetLayout, get_layout_store
+from app.utils.tracing import current_tracer, span, traced_call
+
+
+MERGE_CELL_TAG = f"{{{SHEET_MAIN_NS}}}mergeCell"
+
+# bump whenever a change to the extractor can change its output, so cached
+# tables from the previous version are never served
+EXTRACTOR_VERSION = 3
+
+# process pool size for ``extract_sheets``; 1 extracts serially
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", os.cpu_count() or 1))
+
+# "openpyxl" reads sheets through openpyxl's read-only mode, "xml" through the
+# direct SpreadsheetML reader in ``app.services.spreadsheetml``
+Engine = Literal["openpyxl", "xml"]
+
+# a table is either a list of coerced row records or, with ``columnar=True``,
+# {header: [raw cell values]} to be typed once per column
+TableRows = List[Dict[str, Any]]
+TableColumns = Dict[str, List[Any]]
+Tables = Dict[str, TableRows | TableColumns]
 
 
 # ── small helpers ────────────────────────────────────────────────────────────
@@ -22,21 +57,244 @@ def _coerce(v: Any) -> Any:
     return s
 
 
-def _row_is_empty(ws: Worksheet, r: int, c0: int, c1: int) -> bool:
-    return all(ws.cell(row=r, column=c).value in (None, "") for c in range(c0, c1 + 1))
+def _typed_column(values: List[Any]) -> Any:
+    """
+    Type one extracted column in a single vectorised pass, giving the same
+    values ``_coerce`` would cell by cell: all-numeric columns (numbers or
+    numeric text) become int64/float64 arrays, anything else falls back to
+    per-cell ``_coerce``.
+    """
+    col = Series(values, dtype=object)
+    kind = infer_dtype(col, skipna=True)
+    blank = col.isna() | col.eq("")
+    if kind == "empty" or blank.all():
+        return [None] * len(values)
+
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        numbers = col.astype("float64")
+        is_int = numbers.mod(1).eq(0)
+    elif kind in ("string", "mixed-integer", "mixed"):
+        text = col.str.replace(",", "", regex=False).str.strip()
+        is_text = text.notna()
+        cleaned = text.where(is_text, col).where(~blank)
+        numbers = to_numeric(cleaned, errors="coerce").astype("float64")
+        if (numbers.isna() & ~blank).any():
+            return [_coerce(v) for v in values]
+        # numeric text is only an int when int() would accept it
+        is_int = numbers.mod(1).eq(0) & (
+            ~is_text | text.str.fullmatch(r"[+-]?\d+").fillna(False)
+        )
+    else:
+        return [_coerce(v) for v in values]
+
+    if not blank.any() and is_int.all():
+        # straight from the values: going through float64 rounds past 2**53
+        try:
+            if kind == "integer":
+                return col.to_numpy(dtype="int64")
+            source = cleaned if kind in ("string", "mixed-integer", "mixed") else col
+            return np.array([int(v) for v in source], dtype="int64")
+        except OverflowError:
+            return [_coerce(v) for v in values]
+    return numbers.to_numpy()
+
+
+def _column_rows(columns: TableColumns) -> TableRows:
+    """Raw columns back to the coerced row records of the row extractor."""
+    n_rows = len(next(iter(columns.values()), []))
+    return [
+        {hdr: _coerce(values[i]) for hdr, values in columns.items()}
+        for i in range(n_rows)
+    ]
+
+
+def _title_index(
+    mask: "SheetMask", titles: Iterable[str]
+) -> Dict[str, List[tuple[int, int]]]:
+    """
+    {title: [(row, col), ...]} for every title candidate whose text is one of
+    ``titles``. Duplicate tables are stored as "<title> #n", so those are
+    indexed under their base title.
+    """
+    wanted = {re.sub(r" #\d+$", "", t) for t in titles} | set(titles)
+    index: Dict[str, List[tuple[int, int]]] = {}
+    rows, cols = np.nonzero(mask.title)
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        text = str(mask.values[row, col]).strip()
+        if text in wanted:
+            index.setdefault(text, []).append((row, col))
+    return index
 
 
-def _merged_map(ws: Worksheet) -> Dict[tuple[int, int], CellRange]:
+def _read_merged_ranges(ws: ReadOnlyWorksheet) -> List[CellRange]:
     """
-    {(row, col): CellRange} for every cell *inside* a merged range
-    (including the top-left anchor).
+    Read-only worksheets do not expose ``merged_cells``, so pull the
+    ``<mergeCell ref=...>`` entries straight from the sheet xml.
     """
-    m: Dict[tuple[int, int], CellRange] = {}
-    for rng in ws.merged_cells.ranges:
-        for r in range(rng.min_row, rng.max_row + 1):
-            for c in range(rng.min_col, rng.max_col + 1):
-                m[(r, c)] = rng
-    return m
+    ranges: List[CellRange] = []
+    with ws._get_source() as src:
+        for _, el in iterparse(src):
+            if el.tag == MERGE_CELL_TAG:
+                ranges.append(CellRange(el.get("ref")))
+            el.clear()
+    return ranges
+
+
+# ── sheet grid ───────────────────────────────────────────────────────────────
+class SheetGrid:
+    """
+    Dense, 1-indexed value grid for a single worksheet, read in one streaming
+    pass. Cells covered by a merged range (other than its top-left anchor) are
+    blank, matching what a fully loaded openpyxl worksheet reports.
+
+    A grid may be a masked view over another grid's cells (see ``masked``):
+    row numbers then count only the visible rows, while the ``merged`` ranges
+    keep the sheet's own coordinates (``SheetMask`` translates them).
+    """
+
+    def __init__(
+        self,
+        rows: List[List[Any]],
+        merged: List[CellRange],
+        row_map: Optional[List[int]] = None,
+    ):
+        self.rows = rows
+        self.merged = merged
+        # visible row -> 0-based index into ``rows``
+        self._row_map = row_map if row_map is not None else range(len(rows))
+        self._masks: Dict[int, SheetMask] = {}
+        self._views: Dict[Tuple[int, ...], SheetGrid] = {}
+
+    @property
+    def max_row(self) -> int:
+        return len(self._row_map)
+
+    def masked(self, skip_rows: List[int]) -> "SheetGrid":
+        """
+        View of the grid with these (visible) rows hidden. No cells are copied
+        or moved, so one parsed sheet can serve any number of skip lists. Views
+        are kept per skip list, so their masks are only built once.
+        """
+        hidden = set(skip_rows)
+        skip = tuple(sorted(hidden))
+        if skip not in self._views:
+            row_map = [
+                source
+                for i, source in enumerate(self._row_map, start=1)
+                if i not in hidden
+            ]
+            self._views[skip] = SheetGrid(self.rows, self.merged, row_map)
+        return self._views[skip]
+
+    def mask(self, max_col: int) -> "SheetMask":
+        """Detection arrays over the first ``max_col`` columns, built once."""
+        if max_col not in self._masks:
+            self._masks[max_col] = SheetMask(self, max_col)
+        return self._masks[max_col]
+
+
+class SheetMask:
+    """
+    Array form of a grid's first ``max_col`` columns for table detection.
+
+    ``values`` holds the cells, ``filled`` marks the non-blank ones, ``title``
+    the title candidates (filled with a filled cell below) and ``continued``
+    the blank cells a merge starting to their left on the same row covers.
+    Arrays use the grid's 1-indexed visible rows and columns, with a blank
+    border, so looking one row below the sheet or one column past
+    ``max_col`` reads as blank.
+    """
+
+    def __init__(self, grid: SheetGrid, max_col: int):
+        n_rows = grid.max_row
+        self.max_col = max_col
+        self.values = np.full((n_rows + 2, max_col + 2), None, dtype=object)
+        for row, source in enumerate(grid._row_map, start=1):
+            cells = grid.rows[source][:max_col]
+            # dtype=object, or numpy would turn mixed ints and floats to floats
+            self.values[row, 1 : len(cells) + 1] = np.array(cells, dtype=object)
+
+        self.filled = (self.values != None) & (self.values != "")  # noqa: E711
+        self.title = np.zeros_like(self.filled)
+        self.title[:-1] = self.filled[:-1] & self.filled[1:]
+
+        self.continued = np.zeros_like(self.filled)
+        visible = {source + 1: row for row, source in enumerate(grid._row_map, start=1)}
+        for rng in grid.merged:
+            row = visible.get(rng.min_row)
+            if row is not None and rng.min_col < max_col:
+                last_col = min(rng.max_col, max_col)
+                self.continued[row, rng.min_col + 1 : last_col + 1] = True
+
+    def header_block(self, row: int, col: int) -> Tuple[List[str], List[int], int]:
+        """
+        Headers on ``row`` from ``col`` rightwards, up to the first cell that
+        is neither filled nor a merged continuation. Returns the headers,
+        their columns and the last column of the block.
+        """
+        end = self.max_col + 1
+        run = self.filled[row, col:end] | self.continued[row, col:end]
+        stops = np.flatnonzero(~run)
+        last_col = col - 1 + (int(stops[0]) if len(stops) else len(run))
+        header_cols = (
+            np.flatnonzero(self.filled[row, col : last_col + 1]) + col
+        ).tolist()
+        headers = [str(self.values[row, c]).strip() for c in header_cols]
+        return headers, header_cols, last_col
+
+    def block_end(self, first_row: int, first_col: int, last_col: int) -> int:
+        """First row from ``first_row`` that is blank across the columns."""
+        filled = self.filled[first_row:, first_col : last_col + 1].any(axis=1)
+        # the bottom border row is blank, so there always is one
+        return first_row + int(np.argmin(filled))
+
+    def column(self, col: int, first_row: int, end_row: int) -> List[Any]:
+        return self.values[first_row:end_row, col].tolist()
+
+
+def _dense_rows(rows: Iterable[Tuple[int, Sequence[Any]]]) -> List[List[Any]]:
+    """
+    (row number, values) pairs to a dense list of rows. Some sheets declare
+    all 1,048,576 rows, so blank rows are only kept once a non-blank row
+    follows them and trailing padding is never stored.
+    """
+    dense: List[List[Any]] = []
+    for idx, values in rows:
+        if all(v in (None, "") for v in values):
+            continue
+        dense.extend([] for _ in range(idx - 1 - len(dense)))
+        dense.append(list(values))
+    return dense
+
+
+def _sheet_grid(rows: List[List[Any]], merged_ranges: List[CellRange]) -> SheetGrid:
+    for rng in merged_ranges:
+        for r in range(rng.min_row, min(rng.max_row, len(rows)) + 1):
+            cells = rows[r - 1]
+            for c in range(rng.min_col, min(rng.max_col, len(cells)) + 1):
+                if (r, c) != (rng.min_row, rng.min_col):
+                    cells[c - 1] = None
+    return SheetGrid(rows, merged_ranges)
+
+
+def _read_sheet_grid(ws: ReadOnlyWorksheet) -> SheetGrid:
+    with span("sheet_read", sheet=ws.title) as s:
+        rows = _dense_rows(enumerate(ws.iter_rows(values_only=True), start=1))
+        s.rows = len(rows)
+    with span("merge_map", sheet=ws.title) as s:
+        merged_ranges = _read_merged_ranges(ws)
+        s.rows = len(merged_ranges)
+        return _sheet_grid(rows, merged_ranges)
+
+
+def _read_xml_sheet_grid(reader: XlsxReader, sheet_name: str) -> SheetGrid:
+    with span("sheet_read", sheet=sheet_name) as s:
+        rows = _dense_rows(reader.iter_sheet(sheet_name))
+        s.rows = len(rows)
+    with span("merge_map", sheet=sheet_name) as s:
+        merged_ranges = [CellRange(ref) for ref in reader.merged_refs]
+        s.rows = len(merged_ranges)
+        return _sheet_grid(rows, merged_ranges)
 
 
 # ── main extractor ───────────────────────────────────────────────────────────
@@ -47,7 +305,94 @@ def extract_tables(
     max_width: str | int = "AZ",
     debug: bool = False,
     sheet_skip_rows: Optional[list[int]] = None,
-) -> Dict[str, List[Dict[str, Any]]]:
+    titles: Optional[Iterable[str]] = None,
+    columnar: bool = False,
+    use_cache: bool = True,
+    engine: Engine = "openpyxl",
+) -> Tables:
+    """
+    Extract the tables from one sheet of the workbook at ``file_path`` (only
+    ``titles``, when given), consulting the shared table cache and layout
+    store first (``use_cache=False`` always scans from scratch). Use a
+    ``WorkbookSession`` instead when reading more than one sheet.
+    """
+    with _open_session(file_path, engine, use_cache) as workbook:
+        return workbook.extract_tables(
+            sheet_name,
+            max_width=max_width,
+            debug=debug,
+            sheet_skip_rows=sheet_skip_rows,
+            titles=titles,
+            columnar=columnar,
+        )
+
+
+def _read_block(
+    mask: "SheetMask",
+    data_start_row: int,
+    first_col: int,
+    last_col: int,
+    headers: List[str],
+    header_cols: List[int],
+    *,
+    keep: bool,
+    columnar: bool,
+    debug: bool = False,
+) -> Tuple[TableRows | TableColumns, int]:
+    """
+    Data rows under a header block, down to the first row that is blank
+    across the block. Returns the table (empty unless ``keep``) and the row
+    the block ends on.
+    """
+    end_row = mask.block_end(data_start_row, first_col, last_col)
+    if debug:
+        for r in range(data_start_row, end_row):
+            print(f"          data row R{r}")
+    if not keep:
+        return ({} if columnar else []), end_row
+    with span("read_table", columns=len(headers)) as s:
+        s.rows = end_row - data_start_row
+        if columnar:
+            # like the row records, a repeated header keeps the last column
+            sources = {hdr: header_cols[i] for i, hdr in enumerate(headers)}
+            columns: TableColumns = {
+                hdr: mask.column(c, data_start_row, end_row)
+                for hdr, c in sources.items()
+            }
+            return columns, end_row
+        data: TableRows = [
+            {hdr: _coerce(cells[header_cols[i]]) for i, hdr in enumerate(headers)}
+            for cells in mask.values[data_start_row:end_row]
+        ]
+        return data, end_row
+
+
+def _unique_title(title: str, seen_titles: set[str]) -> str:
+    """Duplicate titles become "<title> #2", "<title> #3", ..."""
+    unique_title = title
+    n = 2
+    while unique_title in seen_titles:
+        unique_title = f"{title} #{n}"
+        n += 1
+    seen_titles.add(unique_title)
+    return unique_title
+
+
+def _max_col(max_width: str | int) -> int:
+    if isinstance(max_width, str):
+        return column_index_from_string(max_width)
+    return int(max_width)
+
+
+def extract_grid_tables(
+    grid: SheetGrid,
+    *,
+    max_width: str | int = "AZ",
+    debug: bool = False,
+    titles: Optional[Iterable[str]] = None,
+    columnar: bool = False,
+    layout: Optional[SheetLayout] = None,
+) -> Tables:
     """
     Row-by-row extractor that respects merged header cells.
 
@@ -59,120 +404,535 @@ def extract_tables(
         – stop when you hit a truly blank column (not merged with left header).
     • For each logical header we remember its *exact column index* so data keeps
       alignment even when headers span multiple columns.
+    • With ``titles`` only those tables are materialised (others are just
+      measured to keep the scan identical), and the scan stops as soon as all
+      of them are found or no candidate title cell is left below.
+    • With ``columnar`` each table is {header: [raw values]}, left for
+      ``convert_to_df_dict`` to type per column instead of per cell.
+    • A ``layout`` list is filled with the tables found, for
+      ``extract_layout_tables`` to replay on the next report. With ``titles``
+      it ends with the whole row the last of them is on.
+
+    The cell tests run on the grid's ``SheetMask``: the scan only visits rows
+    and columns holding a title candidate, and header and data extents are
+    single array scans.
     """
-    max_col_limit = (
-        column_index_from_string(max_width)
-        if isinstance(max_width, str)
-        else int(max_width)
-    )
+    max_col_limit = _max_col(max_width)
+    mask = grid.mask(max_col_limit)
 
-    wb = load_workbook(file_path, data_only=True)
-    ws = wb[sheet_name]
-    if sheet_skip_rows:
-        # delete these rows, biggest to smallest to avoid shifting
-        for row in reversed(sheet_skip_rows):
-            ws.delete_rows(row)
-    max_row = ws.max_row
-    merged_lookup = _merged_map(ws)
+    wanted: Optional[set[str]] = None
+    scan_to_row = grid.max_row
+    if titles is not None:
+        wanted = set(titles)
+        title_index = _title_index(mask, wanted)
+        scan_to_row = max(
+            (r for cells in title_index.values() for r, _ in cells), default=0
+        )
 
-    tables: Dict[str, List[Dict[str, Any]]] = {}
+    tables: Tables = {}
+    seen_titles: set[str] = set()
+    found_all = False
+    # every row holding a candidate starts at least one table
+    title_rows = np.flatnonzero(mask.title.any(axis=1))
     row = 1
 
-    while row <= max_row:
+    while True:
+        i = int(np.searchsorted(title_rows, row))
+        if i == len(title_rows) or title_rows[i] > scan_to_row:
+            break
+        if layout is not None:
+            layout.append({"gap": int(title_rows[i]) - row, "tables": []})
+        row = int(title_rows[i])
         if debug:
             print(f"[ROW {row}] scanning")
         col = 1
         deepest_row_reached = row
-        found_any_table = False
 
-        while col <= max_col_limit:
-            cell_val = ws.cell(row=row, column=col).value
-            if debug:
-                print(f"  → (R{row},C{col}) {repr(cell_val)}")
-            if cell_val in (None, ""):
-                col += 1
-                continue
-
-            # title candidate found – must have non-blank just below
-            if ws.cell(row=row + 1, column=col).value in (None, ""):
-                col += 1
-                continue
+        for title_col in np.flatnonzero(mask.title[row]).tolist():
+            if title_col < col:
+                continue  # inside the header block of the table to the left
 
             # ── TABLE DETECTED ────────────────────────────────────────────────
-            found_any_table = True
-            title = str(cell_val).strip()
+            col = title_col
+            title = str(mask.values[row, col]).strip()
             if debug:
                 print(f"    >>> table '{title}' at R{row}C{col}")
 
-            header_row = row + 1
-            data_start_row = row + 2
-            headers: List[str] = []
-            header_cols: List[int] = []
-
-            cur_col = col
-            while cur_col <= max_col_limit:
-                hv = ws.cell(row=header_row, column=cur_col).value
-                if hv not in (None, ""):
-                    headers.append(str(hv).strip())
-                    header_cols.append(cur_col)
-                    cur_col += 1
-                    continue
-
-                # hv is blank – is it part of a merge that started earlier?
-                rng = merged_lookup.get((header_row, cur_col))
-                if rng and rng.min_row == header_row and rng.min_col < cur_col:
-                    # continuation of previous header – skip it
-                    cur_col += 1
-                    continue
-
-                break  # truly blank – header block ends
-
-            if not headers:  # should not happen
-                col += 1
-                continue
-
-            last_header_col = cur_col - 1
+            headers, header_cols, last_header_col = mask.header_block(row + 1, col)
             if debug:
                 print(f"        headers: {headers} (cols {header_cols})")
 
+            unique_title = _unique_title(title, seen_titles)
+            keep = not found_all and (wanted is None or unique_title in wanted)
+            if layout is not None:
+                layout[-1]["tables"].append(
+                    {
+                        "key": unique_title,
+                        "title": title,
+                        "col": col,
+                        "headers": headers,
+                        "header_cols": header_cols,
+                        "last_col": last_header_col,
+                    }
+                )
+
             # ── DATA ROWS ─────────────────────────────────────────────────────
-            data: List[Dict[str, Any]] = []
-            r = data_start_row
-            while r <= max_row and not _row_is_empty(ws, r, col, last_header_col):
+            table, r = _read_block(
+                mask,
+                row + 2,
+                col,
+                last_header_col,
+                headers,
+                header_cols,
+                keep=keep,
+                columnar=columnar,
+                debug=debug,
+            )
+
+            if keep:
+                tables[unique_title] = table
                 if debug:
-                    print(f"          data row R{r}")
-                rec = {
-                    hdr: _coerce(ws.cell(row=r, column=header_cols[i]).value)
-                    for i, hdr in enumerate(headers)
-                }
-                data.append(rec)
-                r += 1
-
-            # store, avoid duplicate keys
-            unique_title = title
-            n = 2
-            while unique_title in tables:
-                unique_title = f"{title} #{n}"
-                n += 1
-            tables[unique_title] = data
-            if debug:
-                print(f"    <<< finished '{unique_title}' with {len(data)} rows\n")
+                    print(f"    <<< finished '{unique_title}' with {r - row - 2} rows\n")
+                if wanted is not None and len(tables) == len(wanted):
+                    if layout is None:
+                        return tables
+                    # record the rest of the row, so its layout stays whole
+                    found_all = True
 
             deepest_row_reached = max(deepest_row_reached, r)
             col = last_header_col + 1  # resume scanning to the right
 
+        if found_all:
+            return tables
         # advance to next scan line
-        row = deepest_row_reached if found_any_table else row + 1
+        row = deepest_row_reached
+
+    return tables
+
+
+def _row_matches(
+    mask: SheetMask, title_row: int, anchors: List[Dict[str, Any]]
+) -> bool:
+    """
+    Whether a full scan of ``title_row`` would start exactly the layout's
+    tables: walking the row's title candidates left to right, each one not
+    inside the previous table's header block must be the next anchor.
+    """
+    remaining = iter(anchors)
+    col = 1
+    for title_col in np.flatnonzero(mask.title[title_row]).tolist():
+        if title_col < col:
+            continue
+        anchor = next(remaining, None)
+        if anchor is None or anchor["col"] != title_col:
+            return False
+        col = anchor["last_col"] + 1
+    return next(remaining, None) is None
+
+
+def extract_layout_tables(
+    grid: SheetGrid,
+    layout: SheetLayout,
+    *,
+    max_width: str | int = "AZ",
+    titles: Optional[Iterable[str]] = None,
+    columnar: bool = False,
+) -> Optional[Tables]:
+    """
+    Read the tables at the positions a learned ``layout`` gives instead of
+    scanning for them, or return None when the sheet does not match it.
+
+    Each table is checked where the layout expects it: the rows skipped
+    before its title row must hold no title candidate, every candidate on the
+    title row must be one of the row's anchors (or sit inside an anchor's
+    header block), the title cell must carry the same text and a header scan
+    from it must give the same headers and columns. Data blocks are read as
+    usual, so tables may grow or shrink between reports and the tables below
+    simply move with them. Without ``titles`` the rows after the last table
+    must hold no further tables.
+    """
+    max_col_limit = _max_col(max_width)
+    wanted: Optional[set[str]] = None
+    if titles is not None:
+        wanted = set(titles)
+        known = {anchor["key"] for group in layout for anchor in group["tables"]}
+        if not wanted <= known:
+            return None
+
+    mask = grid.mask(max_col_limit)
+    tables: Tables = {}
+    seen_titles: set[str] = set()
+    row = 1
+    for group in layout:
+        title_row = row + group["gap"]
+        if title_row > grid.max_row or mask.title[row:title_row].any():
+            return None
+
+        if not _row_matches(mask, title_row, group["tables"]):
+            return None
+
+        deepest_row_reached = title_row
+        for anchor in group["tables"]:
+            col = anchor["col"]
+            if str(mask.values[title_row, col]).strip() != anchor["title"]:
+                return None
+            headers, header_cols, last_header_col = mask.header_block(
+                title_row + 1, col
+            )
+            if (headers, header_cols, last_header_col) != (
+                anchor["headers"],
+                anchor["header_cols"],
+                anchor["last_col"],
+            ):
+                return None
 
+            unique_title = _unique_title(anchor["title"], seen_titles)
+            keep = wanted is None or unique_title in wanted
+            table, r = _read_block(
+                mask,
+                title_row + 2,
+                col,
+                last_header_col,
+                headers,
+                header_cols,
+                keep=keep,
+                columnar=columnar,
+            )
+            if keep:
+                tables[unique_title] = table
+                if wanted is not None and len(tables) == len(wanted):
+                    return tables
+            deepest_row_reached = max(deepest_row_reached, r)
+        row = deepest_row_reached
+
+    if wanted is None and mask.title[row:].any():
+        return None
     return tables
 
 
-def convert_to_df_dict(tables: Dict[str, List[Dict[str, Any]]]) -> Dict[str, DataFrame]:
+# ── workbook session ─────────────────────────────────────────────────────────
+class WorkbookSession:
+    """
+    Parses a workbook once (from a path or the raw xlsx bytes) and serves any
+    number of sheet extractions from that single parse. Sheet grids and
+    extracted tables are cached, so loaders sharing a sheet reuse them.
+
+    With a ``TableCache`` whole-sheet extractions are looked up by the
+    workbook's content hash first, and the workbook is only opened on a miss.
+    With a ``LayoutStore`` sheets are read at the table positions learned
+    from an earlier report, falling back to a full scan when they moved.
+    ``engine`` picks how sheets are read; both give identical grids.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | bytes,
+        *,
+        cache: Optional[TableCache] = None,
+        layouts: Optional[LayoutStore] = None,
+        engine: Engine = "openpyxl",
+    ):
+        if engine not in ("openpyxl", "xml"):
+            raise ValueError(f"Unknown extraction engine: {engine}")
+        if cache is not None and not isinstance(source, bytes):
+            with open(source, "rb") as file:
+                source = file.read()
+        self._source = source
+        self._cache = cache
+        self._layouts = layouts
+        self._engine = engine
+        self._digest = workbook_digest(source) if cache is not None else None
+        self._wb = None
+        self._grids: Dict[str, SheetGrid] = {}
+        self._tables: Dict[tuple, Tables] = {}
+        self._cached_sheets: Dict[tuple, Dict[str, TableColumns]] = {}
+
+    def __enter__(self) -> "WorkbookSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._wb is not None:
+            self._wb.close()
+
+    @property
+    def workbook(self):
+        if self._wb is not None:
+            return self._wb
+        with span("workbook_open", engine=self._engine):
+            if self._engine == "xml":
+                self._wb = XlsxReader(self._source)
+            else:
+                source = self._source
+                if isinstance(source, bytes):
+                    source = BytesIO(source)
+                self._wb = load_workbook(source, read_only=True, data_only=True)
+        return self._wb
+
+    @property
+    def sheet_names(self) -> List[str]:
+        if self._engine == "xml":
+            return self.workbook.sheet_names
+        return self.workbook.sheetnames
+
+    def grid(self, sheet_name: str) -> SheetGrid:
+        if sheet_name not in self._grids and self._engine == "xml":
+            self._grids[sheet_name] = _read_xml_sheet_grid(self.workbook, sheet_name)
+        elif sheet_name not in self._grids:
+            self._grids[sheet_name] = _read_sheet_grid(self.workbook[sheet_name])
+        return self._grids[sheet_name]
+
+    def _extract(
+        self,
+        sheet_name: str,
+        sheet_skip_rows: Optional[list[int]],
+        **kwargs,
+    ) -> Tables:
+        grid = self.grid(sheet_name)
+        if sheet_skip_rows:
+            grid = grid.masked(sheet_skip_rows)
+        with span("detect", sheet=sheet_name) as s:
+            tables = self._detect(grid, sheet_name, sheet_skip_rows, **kwargs)
+            s.rows = len(tables)
+        return tables
+
+    def _detect(
+        self,
+        grid: SheetGrid,
+        sheet_name: str,
+        sheet_skip_rows: Optional[list[int]],
+        *,
+        max_width: str | int = "AZ",
+        debug: bool = False,
+        titles: Optional[Iterable[str]] = None,
+        columnar: bool = False,
+    ) -> Tables:
+        if self._layouts is None or debug:
+            return extract_grid_tables(
+                grid, max_width=max_width, debug=debug, titles=titles, columnar=columnar
+            )
+
+        # a titled scan stops early and records only part of the sheet, so
+        # it is stored under its titles; a whole-sheet layout serves any
+        entry = (sheet_name, tuple(sorted(sheet_skip_rows or [])), max_width)
+        entries = [entry]
+        if titles is not None:
+            titles = frozenset(titles)
+            entries.append((*entry, tuple(sorted(titles))))
+        for key in entries:
+            layout = self._layouts.get(EXTRACTOR_VERSION, key)
+            if layout is not None:
+                tables = extract_layout_tables(
+                    grid, layout, max_width=max_width, titles=titles, columnar=columnar
+                )
+                if tables is not None:
+                    return tables
+
+        learned: SheetLayout = []
+        tables = extract_grid_tables(
+            grid, max_width=max_width, titles=titles, columnar=columnar, layout=learned
+        )
+        if learned != layout:
+            self._layouts.put(EXTRACTOR_VERSION, entries[-1], learned)
+        return tables
+
+    def _cached_sheet(
+        self,
+        sheet_name: str,
+        sheet_skip_rows: Optional[list[int]],
+        max_width: str | int,
+        titles: Optional[frozenset[str]] = None,
+    ) -> Dict[str, TableColumns]:
+        """
+        The sheet's tables as raw columns (only ``titles``, when given), via
+        the table cache. A whole-sheet entry serves any titles; without one a
+        titled request runs the targeted extraction and is cached under its
+        titles, so repeated imports asking for the same tables hit as well.
+        """
+        entry = (sheet_name, tuple(sorted(sheet_skip_rows or [])), max_width)
+        if entry not in self._cached_sheets:
+            tables = self._cache.get(self._digest, EXTRACTOR_VERSION, entry)
+            if tables is not None:
+                self._cached_sheets[entry] = tables
+        if entry in self._cached_sheets or titles is None:
+            key = entry
+        else:
+            key = (*entry, tuple(sorted(titles)))
+
+        if key not in self._cached_sheets:
+            tables = self._cache.get(self._digest, EXTRACTOR_VERSION, key)
+            if tables is None:
+                tables = self._extract(
+                    sheet_name,
+                    sheet_skip_rows,
+                    max_width=max_width,
+                    titles=titles,
+                    columnar=True,
+                )
+                self._cache.put(self._digest, EXTRACTOR_VERSION, key, tables)
+            self._cached_sheets[key] = tables
+        return self._cached_sheets[key]
+
+    def extract_tables(
+        self,
+        sheet_name: str,
+        *,
+        max_width: str | int = "AZ",
+        debug: bool = False,
+        sheet_skip_rows: Optional[list[int]] = None,
+        titles: Optional[Iterable[str]] = None,
+        columnar: bool = False,
+    ) -> Tables:
+        wanted = frozenset(titles) if titles is not None else None
+        if self._cache is not None and not debug:
+            # the cache holds raw columns; slice and shape them
+            tables = self._cached_sheet(sheet_name, sheet_skip_rows, max_width, wanted)
+            return {
+                title: table if columnar else _column_rows(table)
+                for title, table in tables.items()
+                if wanted is None or title in wanted
+            }
+
+        key = (sheet_name, tuple(sorted(sheet_skip_rows or [])), max_width, columnar)
+        if wanted is not None and key in self._tables:
+            # a full extraction of this sheet already covers the request
+            tables = self._tables[key]
+            return {t: tables[t] for t in tables if t in wanted}
+
+        cache_key = key if wanted is None else (*key, wanted)
+        if cache_key not in self._tables:
+            self._tables[cache_key] = self._extract(
+                sheet_name,
+                sheet_skip_rows,
+                max_width=max_width,
+                debug=debug,
+                titles=wanted,
+                columnar=columnar,
+            )
+        return self._tables[cache_key]
+
+    def table(
+        self,
+        sheet_name: str,
+        title: str,
+        *,
+        sheet_skip_rows: Optional[list[int]] = None,
+        columnar: bool = False,
+    ) -> TableRows | TableColumns:
+        """A single table, e.g. the one an ``ICEDataLoader`` reads."""
+        return self.extract_tables(
+            sheet_name,
+            sheet_skip_rows=sheet_skip_rows,
+            titles=[title],
+            columnar=columnar,
+        )[title]
+
+
+def _open_session(
+    source: str | Path | bytes, engine: Engine, use_cache: bool
+) -> WorkbookSession:
+    """A session backed by the shared table cache and layout store."""
+    if not use_cache:
+        return WorkbookSession(source, engine=engine)
+    return WorkbookSession(
+        source, cache=get_table_cache(), layouts=get_layout_store(), engine=engine
+    )
+
+
+# ── parallel extraction ──────────────────────────────────────────────────────
+def extract_sheet(
+    source: str | Path | bytes,
+    sheet_name: str,
+    *,
+    engine: Engine = "openpyxl",
+    use_cache: bool = True,
+    **kwargs,
+) -> Tables:
+    """
+    One sheet extraction as a plain top-level function, so it can run in a
+    worker process; the returned tables are plain (picklable) data.
+    """
+    with _open_session(source, engine, use_cache) as workbook:
+        return workbook.extract_tables(sheet_name, **kwargs)
+
+
+def extract_workbook(
+    source: str | Path | bytes,
+    requests: List[Dict[str, Any]],
+    *,
+    engine: Engine = "openpyxl",
+    use_cache: bool = True,
+) -> List[Tables]:
+    """
+    Several sheet extractions from one ``WorkbookSession``, as a top-level
+    function so a whole workbook can be extracted in one worker process.
+    """
+    with _open_session(source, engine, use_cache) as workbook:
+        return [workbook.extract_tables(**request) for request in requests]
+
+
+async def extract_sheets(
+    source: str | Path | bytes,
+    requests: List[Dict[str, Any]],
+    *,
+    workers: int = EXTRACT_WORKERS,
+    engine: Engine = "openpyxl",
+    use_cache: bool = True,
+) -> List[Tables]:
+    """
+    Run independent sheet extractions, each given as ``extract_tables``
+    keyword arguments (``sheet_name`` included), without blocking the event
+    loop. With more than one worker and request they are spread over a
+    process pool; otherwise they run serially in a thread, sharing a single
+    ``WorkbookSession``.
+    """
+    loop = asyncio.get_running_loop()
+    if workers > 1 and len(requests) > 1:
+        tracer = current_tracer()
+        with ProcessPoolExecutor(max_workers=min(workers, len(requests))) as pool:
+            calls = [
+                partial(
+                    extract_sheet, source, engine=engine, use_cache=use_cache, **request
+                )
+                for request in requests
+            ]
+            if tracer is None:
+                return await asyncio.gather(
+                    *(loop.run_in_executor(pool, call) for call in calls)
+                )
+            # workers record their own spans and hand them back
+            traced = await asyncio.gather(
+                *(loop.run_in_executor(pool, traced_call, call) for call in calls)
+            )
+            for _, spans in traced:
+                tracer.extend(spans)
+            return [tables for tables, _ in traced]
+
+    return await asyncio.to_thread(
+        extract_workbook, source, requests, engine=engine, use_cache=use_cache
+    )
+
+
+def convert_to_df_dict(tables: Tables) -> Dict[str, DataFrame]:
 
     data = {}
 
-    for title, rows in tables.items():
-        df = DataFrame(rows)
-        data[title] = df
+    with span("to_dataframe") as s:
+        for title, table in tables.items():
+            if isinstance(table, dict):
+                # columnar: infer each column's dtype once
+                n_rows = len(next(iter(table.values()), []))
+                if n_rows == 0:
+                    df = DataFrame()
+                else:
+                    df = DataFrame(
+                        {hdr: _typed_column(v) for hdr, v in table.items()}
+                    )
+            else:
+                df = DataFrame(table)
+            data[title] = df
+        s.rows = sum(len(df) for df in data.values())
 
     return data
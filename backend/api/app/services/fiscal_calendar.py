@@ -0,0 +1,89 @@
+"""
+The federal fiscal calendar: fiscal year 2025 runs from October 2024 to
+September 2025, quarter 1 being October to December.
+
+Each fiscal year's months are generated once and cached in-process, so the
+loaders look up a month's end by its column abbreviation instead of parsing
+dates per cell. The same months are stored in the ``fiscal_calendar`` table,
+joined to the fact tables on ``month_end`` for fiscal year and quarter
+aggregations.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import FiscalCalendar
+
+
+MONTH_ABBRS = (
+    "Oct", "Nov", "Dec", "Jan", "Feb", "Mar",
+    "Apr", "May", "Jun", "Jul", "Aug", "Sep",
+)  # fmt: skip
+
+
+class FiscalMonth:
+    """One month of the calendar, as stored in ``fiscal_calendar``."""
+
+    __slots__ = (
+        "fiscal_year",
+        "fiscal_month",
+        "quarter",
+        "month_abbr",
+        "month_start",
+        "month_end",
+    )
+
+    def __init__(self, fiscal_year: int, fiscal_month: int):
+        # Oct-Dec fall in the calendar year before the fiscal year
+        month = (fiscal_month + 8) % 12 + 1
+        year = fiscal_year - 1 if month >= 10 else fiscal_year
+        next_start = datetime(year + month // 12, month % 12 + 1, 1)
+
+        self.fiscal_year = fiscal_year
+        self.fiscal_month = fiscal_month
+        self.quarter = (fiscal_month - 1) // 3 + 1
+        self.month_abbr = MONTH_ABBRS[fiscal_month - 1]
+        self.month_start = datetime(year, month, 1)
+        self.month_end = next_start - timedelta(days=1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def fiscal_year_of(date: datetime) -> int:
+    """The fiscal year ``date`` falls in."""
+    return date.year + 1 if date.month >= 10 else date.year
+
+
+@lru_cache(maxsize=None)
+def fiscal_months(fiscal_year: int) -> Mapping[str, FiscalMonth]:
+    """The months of ``fiscal_year`` by abbreviation, Oct to Sep (cached)."""
+    months = [FiscalMonth(fiscal_year, index) for index in range(1, 13)]
+    return MappingProxyType({month.month_abbr: month for month in months})
+
+
+def fiscal_month(month_abbr: str, pub_date: datetime) -> FiscalMonth:
+    """
+    The month ``month_abbr`` (Oct-Sep) of the fiscal year of a report
+    published on ``pub_date``.
+    """
+    try:
+        return fiscal_months(fiscal_year_of(pub_date))[month_abbr]
+    except KeyError:
+        raise ValueError(f"Unknown fiscal month {month_abbr!r}") from None
+
+
+async def ensure_fiscal_year(session: AsyncSession, fiscal_year: int) -> None:
+    """Store the months of ``fiscal_year`` in ``fiscal_calendar`` if missing."""
+    rows = [month.as_dict() for month in fiscal_months(fiscal_year).values()]
+    connection = await session.connection()
+    await connection.execute(
+        insert(FiscalCalendar)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["month_end"])
+    )
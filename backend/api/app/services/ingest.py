@@ -0,0 +1,208 @@
+"""
+Writes loader output (``RowBatch``) for a report into its table.
+
+"copy" streams each batch into the table with PostgreSQL ``COPY`` (asyncpg
+``copy_records_to_table``) on the session's connection, inside its
+transaction. "core" sends each batch as one Core ``INSERT`` executemany.
+Neither builds an ORM instance, identity map entry or relationship append
+per row. "orm" keeps the old path of model instances attached to the
+report and added to the session.
+
+"delta" stores only what changed: rows are staged in a temporary table and
+compared, per natural key, with the current merged value (the newest row
+of an earlier report) by their row digests. Only new or revised values are
+inserted; unchanged ones get ``confirmed_report_id`` set to the new report
+instead. Reports must then be imported in publication order, since a later
+report keeps relying on its predecessors' rows for the values it did not
+store.
+"""
+
+import logging
+import os
+from typing import List
+
+from sqlalchemy import Table, insert, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.loaders.common import RowBatch
+from app.models import DetentionStatsReport
+from app.services.reports import NATURAL_KEYS
+from app.utils.digest import DIGEST_COLUMN, has_digest, row_digests
+from app.utils.staging import (
+    client_defaults,
+    column_list,
+    driver_connection,
+    quote,
+    stage_records,
+)
+
+
+logger = logging.getLogger("openice.ingest")
+
+INSERT_MODES = ("copy", "core", "orm", "delta")
+IMPORT_INSERT_MODE = os.getenv("IMPORT_INSERT_MODE", "copy")
+
+# a value is only the same if these flags are too
+FLAG_COLUMNS = ("range", "incomplete", "started")
+
+
+def with_digests(batch: RowBatch) -> RowBatch:
+    """``batch`` plus the row digest column, for models that have one."""
+    if not has_digest(batch.model) or DIGEST_COLUMN in batch.columns:
+        return batch
+    digests = row_digests(batch.model, batch.columns)
+    return RowBatch(batch.model, {**batch.columns, DIGEST_COLUMN: digests})
+
+
+async def _flush_report(session: AsyncSession, report: DetentionStatsReport) -> int:
+    """The report's id, inserting the report first if needed."""
+    if report.id is None:
+        session.add(report)
+        await session.flush()
+    return report.id
+
+
+async def copy_batch(
+    session: AsyncSession, batch: RowBatch, report: DetentionStatsReport
+) -> int:
+    """COPY ``batch`` into its table in the session's transaction."""
+    table = batch.model.__table__
+    report_id = await _flush_report(session, report)
+    connection = await session.connection()
+    driver = await driver_connection(connection)
+
+    defaults = client_defaults(table, [*batch.columns, "report_id"])
+    tail = (report_id, *defaults.values())
+    await driver.copy_records_to_table(
+        table.name,
+        records=(record + tail for record in batch.records()),
+        columns=[*batch.columns, "report_id", *defaults],
+        schema_name=table.schema,
+    )
+    return len(batch)
+
+
+def _delta_sql(
+    table: Table, stage: str, keys: List[str], values: List[str], defaults: List[str]
+) -> str:
+    """
+    One statement that marks the current rows ``stage`` repeats as confirmed
+    and inserts the rest, returning (inserted, confirmed).
+    """
+    # with a digest, one column tells whether the values are the same
+    compared = [DIGEST_COLUMN] if DIGEST_COLUMN in values else values
+    same_key = " AND ".join(f"s.{quote(c)} = t.{quote(c)}" for c in keys)
+    same_row = " AND ".join(
+        [f"s.{quote(c)} = c.{quote(c)}" for c in keys]
+        + [f"s.{quote(c)} IS NOT DISTINCT FROM c.{quote(c)}" for c in compared]
+    )
+    default_params = "".join(f", :{name}" for name in defaults)
+    return f"""
+        WITH current AS (
+            SELECT DISTINCT ON ({column_list(keys, "t.")})
+                t.id, {column_list([*keys, *compared], "t.")}
+            FROM {quote(table.name)} t
+            JOIN detention_stats_reports r ON r.id = t.report_id
+            WHERE (r.publication_date, r.id) < (:publication_date, :report_id)
+                AND EXISTS (SELECT 1 FROM {quote(stage)} s WHERE {same_key})
+            ORDER BY {column_list(keys, "t.")}, r.publication_date DESC, r.id DESC
+        ),
+        matched AS (
+            SELECT c.id, s.ctid AS stage_row
+            FROM {quote(stage)} s JOIN current c ON {same_row}
+        ),
+        confirmed AS (
+            UPDATE {quote(table.name)} t SET confirmed_report_id = :report_id
+            FROM matched m WHERE t.id = m.id
+            RETURNING t.id
+        ),
+        inserted AS (
+            INSERT INTO {quote(table.name)} (
+                {column_list([*keys, *values, "report_id", "confirmed_report_id", *defaults])}
+            )
+            SELECT {column_list([*keys, *values], "s.")}, :report_id, :report_id{default_params}
+            FROM {quote(stage)} s
+            WHERE NOT EXISTS (SELECT 1 FROM matched m WHERE m.stage_row = s.ctid)
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM inserted), (SELECT count(*) FROM confirmed)
+    """
+
+
+async def delta_batch(
+    session: AsyncSession, batch: RowBatch, report: DetentionStatsReport
+) -> int:
+    """
+    Insert the rows of ``batch`` that are new or revised since the previous
+    reports; returns how many were inserted.
+    """
+    model = batch.model
+    if model not in NATURAL_KEYS:
+        # point-in-time snapshots (processing dispositions) are kept whole
+        return await copy_batch(session, batch, report)
+
+    table = model.__table__
+    report_id = await _flush_report(session, report)
+    connection = await session.connection()
+    newer = await connection.scalar(
+        text(
+            "SELECT source_name FROM detention_stats_reports "
+            "WHERE (publication_date, id) > (:publication_date, :report_id) LIMIT 1"
+        ),
+        {"publication_date": report.publication_date, "report_id": report_id},
+    )
+    if newer is not None:
+        raise ValueError(
+            f"Delta import of {report.source_name} needs reports imported in "
+            f"publication order, but {newer} is newer"
+        )
+
+    keys = [*NATURAL_KEYS[model], *(c for c in FLAG_COLUMNS if c in batch.columns)]
+    values = [c for c in batch.columns if c not in keys]
+    defaults = client_defaults(table, [*batch.columns, "report_id"])
+    stage = f"delta_{table.name}"
+    await stage_records(
+        connection, stage, table, list(batch.columns), batch.records()
+    )
+    result = await connection.execute(
+        text(_delta_sql(table, stage, keys, values, list(defaults))),
+        {
+            "publication_date": report.publication_date,
+            "report_id": report_id,
+            **defaults,
+        },
+    )
+    inserted, confirmed = result.one()
+    logger.info(
+        f"{table.name}: {inserted} new or revised, {confirmed} confirmed unchanged"
+    )
+    return inserted
+
+
+async def insert_batch(
+    session: AsyncSession,
+    batch: RowBatch,
+    report: DetentionStatsReport,
+    mode: str = IMPORT_INSERT_MODE,
+) -> int:
+    """
+    Insert ``batch`` in the session's transaction; returns the rows written.
+    Generated ids and uuids are not read back: nothing on the import path
+    uses them, and the ORM fetches them with RETURNING as part of its flush.
+    """
+    batch = with_digests(batch)
+    if mode == "orm":
+        session.add_all(batch.to_models(report))
+        return len(batch)
+    if mode not in INSERT_MODES:
+        raise ValueError(f"Unknown insert mode {mode!r}, expected one of {INSERT_MODES}")
+    if not len(batch):
+        return 0
+    if mode == "copy":
+        return await copy_batch(session, batch, report)
+    if mode == "delta":
+        return await delta_batch(session, batch, report)
+    report_id = await _flush_report(session, report)
+    connection = await session.connection()
+    await connection.execute(insert(batch.model.__table__), batch.params(report_id))
+    return len(batch)
@@ -1,5 +1,8 @@
+import os
+
 from sqlmodel import select, func
-from sqlalchemy import text, and_
+from sqlalchemy import column, table, text, and_, true
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import (
     DetentionStatsReport,
     AverageDailyPopulation,
@@ -8,9 +11,61 @@ from app.models import (
     BookOutRelease,
     ProcessingDisposition,
     Facility,
+    FiscalCalendar,
 )
 
 
+# the merged_* subqueries keep the newest row per natural key
+NATURAL_KEYS = {
+    AverageDailyPopulation: ("timestamp", "agency", "criminality"),
+    AverageStayLength: ("timestamp", "agency", "criminality"),
+    BookIn: ("timestamp", "agency"),
+    BookOutRelease: ("timestamp", "reason", "criminality"),
+    Facility: ("name",),
+}
+
+# how merged_current_query finds each key's newest row: "view" reads the
+# materialised views below, the others compute it per query (merged_subquery)
+MERGED_STRATEGIES = ("view", "window", "distinct", "lateral")
+MERGED_STRATEGY = os.getenv("MERGED_STRATEGY", "view")
+
+# the merged_* subqueries' ids, materialised and refreshed by every import
+MERGED_VIEWS = {
+    AverageDailyPopulation: table("merged_average_daily_population", column("id")),
+    AverageStayLength: table("merged_average_stay_length", column("id")),
+    BookIn: table("merged_book_in", column("id")),
+    BookOutRelease: table("merged_book_out_release", column("id")),
+    Facility: table("merged_facilities", column("id")),
+}
+
+
+def merged_current_query(model, strategy: str = MERGED_STRATEGY):
+    """
+    Returns a query for the merged rows of ``model``. By default they come
+    from its materialised view: a primary key join, however many reports
+    have been loaded.
+    """
+    if strategy != "view":
+        sub_query = merged_subquery(model, strategy)
+        return select(model).where(model.id.in_(select(sub_query.c.id)))
+    view = MERGED_VIEWS[model]
+    return select(model).join(view, view.c.id == model.id)
+
+
+async def refresh_merged_views(session: AsyncSession) -> None:
+    """
+    Recompute the merged views in the session's transaction; readers keep
+    seeing the previous rows until it commits.
+    """
+    connection = await session.connection()
+    for view in MERGED_VIEWS.values():
+        await connection.exec_driver_sql(
+            f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"
+        )
+        # sized right, the planner joins the view to the table by primary key
+        await connection.exec_driver_sql(f"ANALYZE {view.name}")
+
+
 def current_report_subquery():
     """
     Returns a subquery that selects the ID of the most recent report.
@@ -219,3 +274,116 @@ def merged_facilities_subquery():
         .subquery()
     )
     return select(inner.c.id).where(text("rn = 1")).subquery()
+
+
+def _merged_filters(model) -> list:
+    """The rows the merged_* subqueries consider: complete months only."""
+    if model is Facility:
+        return []
+    return [model.incomplete == False, model.started == True, model.range == "month"]
+
+
+def merged_distinct_subquery(model):
+    """
+    Returns a subquery of the same ids as the merged_*_subquery of ``model``,
+    keeping each natural key's first row with DISTINCT ON instead of ranking
+    every row with a window.
+    """
+    keys = [getattr(model, name) for name in NATURAL_KEYS[model]]
+    return (
+        select(model.id)
+        .join(DetentionStatsReport, model.report_id == DetentionStatsReport.id)
+        .where(*_merged_filters(model))
+        .distinct(*keys)
+        .order_by(
+            *keys,
+            DetentionStatsReport.publication_date.desc(),
+            DetentionStatsReport.id.desc(),
+        )
+        .subquery()
+    )
+
+
+def _same_key(column, key):
+    """
+    Key match that groups NULLs as DISTINCT ON and PARTITION BY do; plain
+    ``=`` (which the natural key index serves) where NULL cannot occur.
+    """
+    if column.nullable:
+        return column.is_not_distinct_from(key)
+    return column == key
+
+
+def merged_lateral_subquery(model):
+    """
+    Returns a subquery of the same ids as the merged_*_subquery of ``model``:
+    the distinct natural keys, each joined LATERAL to its newest row, which
+    the natural key index finds without sorting the whole table.
+    """
+    names = NATURAL_KEYS[model]
+    keys = (
+        select(*(getattr(model, name) for name in names))
+        .where(*_merged_filters(model))
+        .distinct()
+        .subquery("merged_keys")
+    )
+    newest = (
+        select(model.id)
+        .join(DetentionStatsReport, model.report_id == DetentionStatsReport.id)
+        .where(
+            *_merged_filters(model),
+            *(_same_key(getattr(model, name), keys.c[name]) for name in names),
+        )
+        .order_by(
+            DetentionStatsReport.publication_date.desc(),
+            DetentionStatsReport.id.desc(),
+        )
+        .limit(1)
+        .lateral("newest")
+    )
+    return select(newest.c.id).select_from(keys).join(newest, true()).subquery()
+
+
+def merged_subquery(model, strategy: str = MERGED_STRATEGY):
+    """
+    Returns the merged ids of ``model`` computed with ``strategy``: "window"
+    (the merged_*_subquery functions), "distinct" or "lateral".
+    """
+    if strategy == "window":
+        return {
+            AverageDailyPopulation: merged_population_subquery,
+            AverageStayLength: merged_stay_subquery,
+            BookIn: merged_booking_subquery,
+            BookOutRelease: merged_release_subquery,
+            Facility: merged_facilities_subquery,
+        }[model]()
+    if strategy == "distinct":
+        return merged_distinct_subquery(model)
+    if strategy == "lateral":
+        return merged_lateral_subquery(model)
+    raise ValueError(
+        f"Unknown merged strategy {strategy!r}, expected one of {MERGED_STRATEGIES}"
+    )
+
+
+def fiscal_period_query(
+    model, value, merged_ids, group_by=(), quarterly=True, aggregate=func.sum
+):
+    """
+    Returns a query aggregating ``value`` over the merged monthly rows of
+    ``model`` per fiscal year (and quarter), plus any ``group_by`` columns.
+    Complete months are stamped with their month end, so the rows join the
+    fiscal calendar on an indexed equality instead of date arithmetic, e.g.
+    ``fiscal_period_query(BookIn, BookIn.bookings, merged_booking_subquery())``.
+    """
+    periods = [FiscalCalendar.fiscal_year]
+    if quarterly:
+        periods.append(FiscalCalendar.quarter)
+    return (
+        select(*periods, *group_by, aggregate(value).label("value"))
+        .select_from(model)
+        .join(FiscalCalendar, FiscalCalendar.month_end == model.timestamp)
+        .where(model.id.in_(select(merged_ids.c.id)))
+        .group_by(*periods, *group_by)
+        .order_by(*periods, *group_by)
+    )
@@ -0,0 +1,260 @@
+"""
+Minimal streaming reader for .xlsx (SpreadsheetML) workbooks.
+
+Reads only what table extraction needs, straight from the zip: the shared
+string table once, the number formats that mark date cells, and then each
+sheet's ``<c>`` values and ``<mergeCell>`` refs via ``iterparse``. Values
+follow openpyxl's ``data_only`` conventions so both engines give the same
+grid.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+import posixpath
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from xml.etree.ElementTree import iterparse
+from zipfile import ZipFile
+from openpyxl.styles.numbers import (
+    builtin_format_code,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import (
+    MAC_EPOCH,
+    WINDOWS_EPOCH,
+    from_excel,
+    from_ISO8601,
+)
+from openpyxl.xml.constants import SHEET_MAIN_NS
+
+
+MAIN = f"{{{SHEET_MAIN_NS}}}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ROW_TAG = f"{MAIN}row"
+CELL_TAG = f"{MAIN}c"
+VALUE_TAG = f"{MAIN}v"
+INLINE_TAG = f"{MAIN}is"
+TEXT_TAG = f"{MAIN}t"
+RUN_TAG = f"{MAIN}r"
+MERGE_CELL_TAG = f"{MAIN}mergeCell"
+SHARED_STRING_TAG = f"{MAIN}si"
+
+
+@lru_cache(maxsize=None)
+def _column_index(letters: str) -> int:
+    return column_index_from_string(letters)
+
+
+def _split_ref(ref: str) -> Tuple[str, int]:
+    i = 0
+    while ref[i].isalpha():
+        i += 1
+    return ref[:i], int(ref[i:])
+
+
+def _text_content(node) -> str:
+    """Plain text of an ``<si>``/``<is>`` node, ignoring phonetic runs."""
+    snippets = []
+    plain = node.find(TEXT_TAG)
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in node.findall(RUN_TAG):
+        t = run.find(TEXT_TAG)
+        if t is not None and t.text is not None:
+            snippets.append(t.text)
+    return "".join(snippets)
+
+
+def _cast_number(value: str) -> int | float:
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+class XlsxReader:
+    """
+    Read-only access to the sheets of an xlsx file given as a path or bytes.
+    Workbook-level parts (sheet list, shared strings, date styles) are parsed
+    once; sheets are streamed on demand.
+    """
+
+    def __init__(self, source: str | Path | bytes):
+        if isinstance(source, bytes):
+            source = BytesIO(source)
+        self._zip = ZipFile(source)
+        self._sheet_paths = self._read_sheet_paths()
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Set[int] = set()
+        self._timedelta_styles: Set[int] = set()
+        self._read_styles()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_paths)
+
+    # ── workbook parts ──────────────────────────────────────────────────────
+    def _read_rels(self, path: str) -> Dict[str, Tuple[str, str]]:
+        """{rel id: (type, resolved part path)} for the part at ``path``."""
+        folder, name = posixpath.split(path)
+        rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+        rels: Dict[str, Tuple[str, str]] = {}
+        if rels_path not in self._zip.namelist():
+            return rels
+        with self._zip.open(rels_path) as src:
+            for _, el in iterparse(src):
+                if el.tag == f"{PKG_REL}Relationship":
+                    target = el.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join(folder, target))
+                    rels[el.get("Id")] = (el.get("Type").rsplit("/", 1)[-1], target)
+        return rels
+
+    def _workbook_path(self) -> str:
+        for _, (rel_type, target) in self._read_rels("").items():
+            if rel_type == "officeDocument":
+                return target
+        return "xl/workbook.xml"
+
+    def _read_sheet_paths(self) -> Dict[str, str]:
+        workbook_path = self._workbook_path()
+        self._workbook_rels = self._read_rels(workbook_path)
+        self.epoch = WINDOWS_EPOCH
+        paths: Dict[str, str] = {}
+        with self._zip.open(workbook_path) as src:
+            for _, el in iterparse(src):
+                if el.tag == f"{MAIN}workbookPr":
+                    if el.get("date1904") in ("1", "true"):
+                        self.epoch = MAC_EPOCH
+                elif el.tag == f"{MAIN}sheet":
+                    _, target = self._workbook_rels[el.get(f"{REL_NS}id")]
+                    paths[el.get("name")] = target
+        return paths
+
+    def _part_path(self, rel_type: str) -> Optional[str]:
+        for found_type, target in self._workbook_rels.values():
+            if found_type == rel_type:
+                return target
+        return None
+
+    @property
+    def shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            strings: List[str] = []
+            path = self._part_path("sharedStrings")
+            if path is not None:
+                with self._zip.open(path) as src:
+                    for _, el in iterparse(src):
+                        if el.tag == SHARED_STRING_TAG:
+                            strings.append(_text_content(el).replace("x005F_", ""))
+                            el.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    def _read_styles(self) -> None:
+        """Index the cell styles whose number format is a date or duration."""
+        path = self._part_path("styles")
+        if path is None:
+            return
+        custom: Dict[int, str] = {}
+        with self._zip.open(path) as src:
+            in_cell_xfs = False
+            style_id = 0
+            for event, el in iterparse(src, events=("start", "end")):
+                if el.tag == f"{MAIN}cellXfs":
+                    in_cell_xfs = event == "start"
+                elif event == "end" and el.tag == f"{MAIN}numFmt":
+                    custom[int(el.get("numFmtId"))] = el.get("formatCode")
+                elif event == "end" and el.tag == f"{MAIN}xf" and in_cell_xfs:
+                    fmt_id = int(el.get("numFmtId", 0))
+                    fmt = custom.get(fmt_id) or builtin_format_code(fmt_id)
+                    if fmt and is_date_format(fmt):
+                        self._date_styles.add(style_id)
+                    if fmt and is_timedelta_format(fmt):
+                        self._timedelta_styles.add(style_id)
+                    style_id += 1
+
+    # ── sheets ──────────────────────────────────────────────────────────────
+    def _cell_value(self, c) -> Any:
+        data_type = c.get("t", "n")
+        if data_type == "inlineStr":
+            node = c.find(INLINE_TAG)
+            return _text_content(node) if node is not None else None
+
+        value = c.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            value = _cast_number(value)
+            style_id = int(c.get("s") or 0)
+            if style_id in self._date_styles:
+                try:
+                    return from_excel(
+                        value,
+                        self.epoch,
+                        timedelta=style_id in self._timedelta_styles,
+                    )
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return self.shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        return value  # "str" (cached formula text) and "e" (error code)
+
+    def iter_sheet(self, sheet_name: str) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        Yield ``(row number, dense values)`` for each row holding cells, then
+        leave the sheet's merge refs in ``self.merged_refs``.
+        """
+        self.merged_refs: List[str] = []
+        with self._zip.open(self._sheet_paths[sheet_name]) as src:
+            row_idx = 0
+            sheet_data = None
+            for event, el in iterparse(src, events=("start", "end")):
+                if event == "start":
+                    if el.tag == f"{MAIN}sheetData":
+                        sheet_data = el
+                    continue
+                if el.tag == ROW_TAG:
+                    r = el.get("r")
+                    row_idx = int(r) if r else row_idx + 1
+                    values: List[Any] = []
+                    # cells without an "r" follow the previous cell; only
+                    # resolve a column once a cell actually holds something,
+                    # since styled blank cells can run out to column XFD
+                    last_ref, offset = None, 0
+                    for c in el:
+                        ref = c.get("r")
+                        if ref:
+                            last_ref, offset = ref, 0
+                        else:
+                            offset += 1
+                        if c.tag != CELL_TAG or not len(c):
+                            continue
+                        col = offset
+                        if last_ref:
+                            col += _column_index(_split_ref(last_ref)[0])
+                        value = self._cell_value(c)
+                        if value is None:
+                            continue
+                        if col > len(values):
+                            values.extend([None] * (col - len(values)))
+                        values[col - 1] = value
+                    # drop finished rows so memory stays flat on long sheets
+                    sheet_data.clear()
+                    if values:
+                        yield row_idx, values
+                elif el.tag == MERGE_CELL_TAG:
+                    self.merged_refs.append(el.get("ref"))
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+
+logger = logging.getLogger("openice.table-cache")
+
+# set TABLE_CACHE_DIR to an empty string to disable the cache
+TABLE_CACHE_DIR = os.getenv("TABLE_CACHE_DIR", ".cache/tables")
+TABLE_CACHE_MAX_BYTES = int(os.getenv("TABLE_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def workbook_digest(raw_bytes: bytes) -> str:
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+class TableCache:
+    """
+    Content-addressed on-disk cache of extracted report tables.
+
+    Entries are keyed by the SHA-256 of the workbook bytes, the extractor
+    version and the extraction parameters, so a changed file or extractor
+    never hits a stale entry. Values are written as pickles (numeric columns
+    stay numpy buffers, mixed-type text columns keep their exact values) and
+    the least recently used entries are evicted once the directory grows past
+    ``max_bytes``.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = TABLE_CACHE_MAX_BYTES
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str, version: int, entry: tuple) -> Path:
+        entry_hash = hashlib.sha256(repr((version, entry)).encode()).hexdigest()
+        return self.directory / f"{digest}-{entry_hash[:16]}.pkl"
+
+    def get(self, digest: str, version: int, entry: tuple) -> Optional[Any]:
+        path = self._path(digest, version, entry)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        # mtime doubles as the last-used time for eviction
+        os.utime(path)
+        return value
+
+    def put(self, digest: str, version: int, entry: tuple, value: Any) -> None:
+        path = self._path(digest, version, entry)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under ``max_bytes``."""
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[TableCache] = None
+
+
+def get_table_cache() -> Optional[TableCache]:
+    """Shared cache under ``TABLE_CACHE_DIR``, or None when disabled."""
+    global _default_cache
+    if not TABLE_CACHE_DIR:
+        return None
+    if _default_cache is None:
+        _default_cache = TableCache(TABLE_CACHE_DIR)
+    return _default_cache
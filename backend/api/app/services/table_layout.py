@@ -0,0 +1,74 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger("openice.table-layout")
+
+# set TABLE_LAYOUT_DIR to an empty string to disable layout templates
+TABLE_LAYOUT_DIR = os.getenv("TABLE_LAYOUT_DIR", ".cache/layouts")
+
+# [{"gap": rows skipped before the title row,
+#   "tables": [{"key", "title", "col", "headers", "header_cols", "last_col"},
+#              ...]}, ...]
+SheetLayout = List[Dict[str, Any]]
+
+
+class LayoutStore:
+    """
+    Table layouts learned from earlier extractions, one JSON file per sheet.
+
+    A layout lists a sheet's tables in scan order: each title row's offset
+    below the end of the previous tables, and every table's title, anchor
+    column and header cells. Reports of the same fiscal year share a layout,
+    so once one has been scanned the next can be read block by block.
+    Entries are keyed by sheet name and extraction parameters only (not
+    workbook content), which is why they are validated before use.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, version: int, entry: tuple) -> Path:
+        entry_hash = hashlib.sha256(repr((version, entry)).encode()).hexdigest()
+        return self.directory / f"{entry_hash[:24]}.json"
+
+    def get(self, version: int, entry: tuple) -> Optional[SheetLayout]:
+        path = self._path(version, entry)
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable layout {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, version: int, entry: tuple, layout: SheetLayout) -> None:
+        path = self._path(version, entry)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(layout, file)
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+_default_store: Optional[LayoutStore] = None
+
+
+def get_layout_store() -> Optional[LayoutStore]:
+    """Shared store under ``TABLE_LAYOUT_DIR``, or None when disabled."""
+    global _default_store
+    if not TABLE_LAYOUT_DIR:
+        return None
+    if _default_store is None:
+        _default_store = LayoutStore(TABLE_LAYOUT_DIR)
+    return _default_store
@@ -0,0 +1,67 @@
+"""
+Helpers for set-based writes: rows are COPYed into a temporary staging table
+on the session's connection, then merged into their table with one SQL
+statement.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+def quote(name: str) -> str:
+    """Quote a (trusted) identifier: "range" and "timestamp" are keywords."""
+    return f'"{name}"'
+
+
+def column_list(names: Iterable[str], alias: str = "") -> str:
+    return ", ".join(f"{alias}{quote(name)}" for name in names)
+
+
+def client_defaults(table: Table, provided: Iterable[str]) -> Dict[str, Any]:
+    """
+    Values of the Python-side column defaults (``created_at``) missing from
+    ``provided``; COPY applies server defaults (ids, ``uuid``) by itself.
+    """
+    provided = set(provided)
+    values = {}
+    for column in table.columns:
+        default = column.default
+        if column.name in provided or default is None:
+            continue
+        if default.is_callable:
+            values[column.name] = default.arg(None)
+        elif default.is_scalar:
+            values[column.name] = default.arg
+    return values
+
+
+async def driver_connection(connection: AsyncConnection):
+    """The asyncpg connection under ``connection``, inside its transaction."""
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    if not driver.is_in_transaction():
+        # the driver opens the transaction lazily, on the first statement
+        await connection.exec_driver_sql("SELECT 1")
+    return driver
+
+
+async def stage_records(
+    connection: AsyncConnection,
+    stage: str,
+    table: Table,
+    columns: List[str],
+    records: Iterable[tuple],
+) -> None:
+    """
+    COPY ``records`` into a temporary table ``stage`` with the types of
+    ``columns`` of ``table``, dropped at the end of the transaction.
+    """
+    await connection.exec_driver_sql(f"DROP TABLE IF EXISTS pg_temp.{quote(stage)}")
+    await connection.exec_driver_sql(
+        f"CREATE TEMP TABLE {quote(stage)} ON COMMIT DROP AS "
+        f"SELECT {column_list(columns)} FROM {quote(table.name)} WITH NO DATA"
+    )
+    driver = await driver_connection(connection)
+    await driver.copy_records_to_table(stage, records=records, columns=columns)
@@ -1,9 +1,20 @@
 from datetime import datetime
 import logging
-from typing import Callable, TypeVar
+import os
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Sequence, TypeVar
+from sqlalchemy import String, TypeDecorator, text
+from sqlmodel import select
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.utils.digest import (
+    DIGEST_COLUMN,
+    NON_CONTENT_FIELDS,
+    same_digest,
+    stamp_digests,
+)
+from app.utils.staging import client_defaults, column_list, quote, stage_records
+
 
 def update_model_if_changed(
     new: SQLModel,
@@ -43,8 +54,27 @@ def update_model_if_changed(
     return changed
 
 
+def _unchanged(new: SQLModel, old: SQLModel, skip_fields: set) -> bool:
+    """
+    True if ``old`` needs no update: the digests match, and so does every
+    bookkeeping field the digest leaves out (``report_id``,
+    ``confirmed_report_id``) that is not in ``skip_fields``.
+    """
+    if not same_digest(new, old):
+        return False
+    for field in NON_CONTENT_FIELDS - skip_fields - {DIGEST_COLUMN}:
+        if field not in type(new).model_fields:
+            continue
+        if _naive(getattr(new, field)) != _naive(getattr(old, field)):
+            return False
+    return True
+
+
 T = TypeVar("T")
 
+# rows per chunk of the streaming sync, flushed together
+SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", "1000"))
+
 
 async def sync_db(
     session: AsyncSession,
@@ -62,12 +92,16 @@ async def sync_db(
     inserts = []
     if skip_fields is None:
         skip_fields = set()
+    stamp_digests(external)
     db_lookup = {key(o): o for o in db}
     for o in external:
         o_key = key(o)
         if o_key in db_lookup:
             found += 1
             o_db = db_lookup[o_key]
+            if _unchanged(o, o_db, skip_fields):
+                # unchanged, the common case: no need to compare the fields
+                continue
             changed = update_model_if_changed(o, o_db, skip_fields, logger)
             if changed:
                 updates.append(o_db)
@@ -92,3 +126,279 @@ async def sync_db(
     if logger:
         logger.info(f"  Added {total:,} and updated {updated:,}/{found:,}")
     return db_lookup
+
+
+async def _chunks(rows: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _part_order(value: Any) -> tuple:
+    return (0,) if value is None else (1, value)
+
+
+def stream_sort_key(key_value: Any) -> tuple:
+    """
+    Sort key for one ``sync_db_stream`` key (a value or a tuple of values),
+    matching the order ``stream_table`` reads rows in: NULLs first, text by
+    code point (``COLLATE "C"``). Sort the external rows by it too.
+    """
+    if isinstance(key_value, tuple):
+        return tuple(_part_order(v) for v in key_value)
+    return _part_order(key_value)
+
+
+async def _sorted(rows: AsyncIterable[T], key: Callable[[T], Any], name: str):
+    """``rows`` as an iterator, failing if they are not sorted by ``key``."""
+    previous = None
+    async for row in rows:
+        row_key = key(row)
+        if previous is not None and row_key < previous:
+            raise ValueError(f"sync_db_stream needs {name} rows sorted by key")
+        previous = row_key
+        yield row
+
+
+def _stream_order(column: Any) -> Any:
+    """
+    ORDER BY term giving the order ``stream_sort_key`` compares in: text is
+    ordered by code point whatever the database collation.
+    """
+    column_type = column.type
+    if isinstance(column_type, TypeDecorator):
+        column_type = column_type.impl_instance
+    if isinstance(column_type, String):
+        column = column.collate("C")
+    return column.asc().nulls_first()
+
+
+def stream_table(
+    session: AsyncSession,
+    model: type[SQLModel],
+    key_fields: Sequence[str],
+    batch_size: int = SYNC_BATCH_SIZE,
+) -> AsyncIterator[SQLModel]:
+    """
+    The rows of ``model`` ordered by ``key_fields`` as ``stream_sort_key``
+    orders them, fetched in batches.
+    """
+
+    async def rows():
+        query = (
+            select(model)
+            .order_by(*(_stream_order(getattr(model, name)) for name in key_fields))
+            .execution_options(yield_per=batch_size)
+        )
+        async for row in await session.stream_scalars(query):
+            yield row
+
+    return rows()
+
+
+async def sync_db_stream(
+    session: AsyncSession,
+    external: AsyncIterable[T],
+    db: AsyncIterable[T],
+    key: Callable[[T], Any],
+    logger: logging.Logger = None,
+    skip_fields: set | None = None,
+    batch_size: int = SYNC_BATCH_SIZE,
+) -> tuple[int, int]:
+    """Streaming ``sync_db``: a merge join of two key-sorted row streams.
+
+    ``external`` and ``db`` must both be sorted by ``stream_sort_key`` of
+    ``key`` (see ``stream_table``), which puts NULLs first and compares text
+    by code point. External rows are read ``batch_size`` at a time and
+    their updates and inserts flushed per chunk, so only one chunk and the
+    current database row are held at once whatever the table sizes. The
+    transaction is committed at the end.
+
+    Returns:
+        tuple[int, int]: The number of rows inserted and updated.
+    """
+    total = 0
+    updated = 0
+    found = 0
+    if skip_fields is None:
+        skip_fields = set()
+    raw_key = key
+
+    def key(row: T) -> tuple:
+        return stream_sort_key(raw_key(row))
+
+    db_rows = _sorted(db, key, "database")
+    o_db = await anext(db_rows, None)
+    inserted = None  # the last insert, which a repeated external key updates
+    async for chunk in _chunks(_sorted(external, key, "external"), batch_size):
+        stamp_digests(chunk)
+        changes = []
+        for o in chunk:
+            o_key = key(o)
+            while o_db is not None and key(o_db) < o_key:
+                o_db = await anext(db_rows, None)
+            if o_db is not None and key(o_db) == o_key:
+                match = o_db
+            elif inserted is not None and key(inserted) == o_key:
+                match = inserted
+            else:
+                changes.append(o)
+                inserted = o
+                total += 1
+                continue
+            found += 1
+            if _unchanged(o, match, skip_fields):
+                # unchanged, the common case: no need to compare the fields
+                continue
+            if update_model_if_changed(o, match, skip_fields, logger):
+                changes.append(match)
+                updated += 1
+        if changes:
+            session.add_all(changes)
+            await session.flush()
+    await session.commit()
+    if logger:
+        logger.info(f"  Added {total:,} and updated {updated:,}/{found:,}")
+    return total, updated
+
+
+def _naive(value: Any) -> Any:
+    # assumes all datetimes are in UTC, as update_model_if_changed does
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return value
+
+
+def _upsert_sql(
+    table: str,
+    stage: str,
+    keys: list[str],
+    values: list[str],
+    defaults: list[str],
+    updated: list[str],
+) -> str:
+    """
+    One INSERT .. ON CONFLICT that merges ``stage`` into ``table``, returning
+    (inserted, updated). New rows get ``values`` and ``defaults``; existing
+    ones only have ``updated`` set, and are left alone when those are all
+    unchanged.
+    """
+    if updated:
+        if DIGEST_COLUMN in updated:
+            # the digest stands in for the content fields, not the others
+            compared = [
+                c for c in updated if c == DIGEST_COLUMN or c in NON_CONTENT_FIELDS
+            ]
+        else:
+            compared = updated
+        assignments = ", ".join(f"{quote(c)} = EXCLUDED.{quote(c)}" for c in updated)
+        on_conflict = (
+            f"DO UPDATE SET {assignments} "
+            f"WHERE ({column_list(compared, 't.')}) "
+            f"IS DISTINCT FROM ({column_list(compared, 'EXCLUDED.')})"
+        )
+    else:
+        on_conflict = "DO NOTHING"
+    default_params = "".join(f", :{name}" for name in defaults)
+    return f"""
+        WITH upserted AS (
+            INSERT INTO {quote(table)} AS t ({column_list([*keys, *values, *defaults])})
+            SELECT DISTINCT ON ({column_list(keys, "s.")})
+                {column_list([*keys, *values], "s.")}{default_params}
+            FROM {quote(stage)} s
+            ORDER BY {column_list(keys, "s.")}, s.ctid DESC
+            ON CONFLICT ({column_list(keys)}) {on_conflict}
+            RETURNING xmax = 0 AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+        FROM upserted
+    """
+
+
+def _upsert_columns(
+    model: type[SQLModel], keys: list[str], skip_fields: set
+) -> tuple[list[str], list[str]]:
+    """
+    The non-key columns ``upsert_db`` writes on insert, and the subset it
+    sets on update: Python-side default factories (``created_at``) stamp a
+    row when it is first written, so they are never overwritten.
+    """
+    table = model.__table__
+    values = [
+        column.name
+        for column in table.columns
+        if column.name in model.model_fields
+        and column.name not in skip_fields
+        and column.name not in keys
+        and not column.primary_key
+        and column.server_default is None
+    ]
+    updated = [
+        name
+        for name in values
+        if table.columns[name].default is None
+        or not table.columns[name].default.is_callable
+    ]
+    return values, updated
+
+
+async def upsert_db(
+    session: AsyncSession,
+    model: type[SQLModel],
+    external: list[SQLModel],
+    key_fields: Sequence[str],
+    logger: logging.Logger = None,
+    skip_fields: set | None = None,
+) -> tuple[int, int]:
+    """Set-based ``sync_db``: merges ``external`` into the table of ``model``.
+
+    The rows are COPYed into a temporary table and merged with one
+    ``INSERT .. ON CONFLICT (key_fields) DO UPDATE``, so nothing of the
+    existing table is loaded into Python. The table needs a unique index or
+    constraint on exactly ``key_fields`` (``CREATE UNIQUE INDEX .. ON
+    <table> (<key_fields>)``), which PostgreSQL infers as the conflict
+    arbiter; the fact tables keep one row per key *per report*, so none of
+    them has one yet. For a repeated key the last row wins. Server-generated columns
+    (the primary key, ``uuid``) and ``skip_fields`` are never written, and
+    Python-side default factories (``created_at``) only on insert. An
+    existing row is updated when its digest or any of its bookkeeping
+    columns (``report_id``, ``confirmed_report_id``) differ.
+
+    Returns:
+        tuple[int, int]: The number of rows inserted and updated.
+    """
+    if skip_fields is None:
+        skip_fields = set()
+    table = model.__table__
+    keys = list(key_fields)
+    values, updated = _upsert_columns(model, keys, skip_fields)
+    inserted = updated_rows = 0
+    if external:
+        stamp_digests(external)
+        columns = [*keys, *values]
+        defaults = client_defaults(table, columns)
+        stage = f"sync_{table.name}"
+        connection = await session.connection()
+        await stage_records(
+            connection,
+            stage,
+            table,
+            columns,
+            (tuple(_naive(getattr(o, c)) for c in columns) for o in external),
+        )
+        result = await connection.execute(
+            text(
+                _upsert_sql(table.name, stage, keys, values, list(defaults), updated)
+            ),
+            defaults,
+        )
+        inserted, updated_rows = result.one()
+        await session.commit()
+    if logger:
+        logger.info(f"  Added {inserted:,} and updated {updated_rows:,}")
+    return inserted, updated_rows
@@ -0,0 +1,176 @@
+"""
+Phase timing for the import pipeline.
+
+Code marks its phases with ``span``; nothing is recorded unless a ``Tracer``
+is active (see ``tracing``), in which case every span records its duration,
+the rows it handled and how much the process RSS grew while it ran. Spans
+wrap whole phases (a sheet read, a table, a loader), never single cells, so
+tracing costs a few microseconds per phase.
+
+    with tracing() as tracer:
+        ...
+    tracer.summary()          # totals per phase, as plain JSON data
+    tracer.write_trace(path)  # Chrome / Perfetto trace events
+"""
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+import json
+import os
+from pathlib import Path
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+_rss_fd: Optional[int] = None
+_rss_pid: Optional[int] = None
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    global _rss_fd, _rss_pid
+    try:
+        if _rss_pid != os.getpid():
+            # a forked worker must not share the parent's descriptor
+            _rss_fd, _rss_pid = os.open("/proc/self/statm", os.O_RDONLY), os.getpid()
+        resident = int(os.pread(_rss_fd, 64, 0).split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Span:
+    """One timed phase; set ``rows`` to the rows (or items) it handled."""
+
+    __slots__ = (
+        "name",
+        "attrs",
+        "rows",
+        "start",
+        "duration",
+        "rss_delta",
+        "pid",
+        "tid",
+    )
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.rows: Optional[int] = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.rss_delta = 0
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is off; attribute writes are dropped."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = nullcontext(_NullSpan())
+
+
+class Tracer:
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.started = time.perf_counter()
+        self._rss_start = _rss_bytes()
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        span = Span(name, attrs)
+        rss = _rss_bytes()
+        span.start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            span.rss_delta = _rss_bytes() - rss
+            self.spans.append(span)
+
+    def extend(self, spans: List[Span]) -> None:
+        """Add spans recorded in a worker process (see ``traced_call``)."""
+        self.spans.extend(spans)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, time, rows and largest RSS growth per phase."""
+        phases: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            phase = phases.setdefault(
+                span.name, {"count": 0, "seconds": 0.0, "rows": 0, "max_rss_delta": 0}
+            )
+            phase["count"] += 1
+            phase["seconds"] += span.duration
+            phase["rows"] += span.rows or 0
+            phase["max_rss_delta"] = max(phase["max_rss_delta"], span.rss_delta)
+        for phase in phases.values():
+            phase["seconds"] = round(phase["seconds"], 6)
+        return {
+            "seconds": round(time.perf_counter() - self.started, 6),
+            "rss_delta": _rss_bytes() - self._rss_start,
+            "phases": phases,
+        }
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """Spans as Chrome trace "complete" events (microseconds)."""
+        return [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": round((span.start - self.started) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": span.pid,
+                "tid": span.tid,
+                "args": {**span.attrs, "rows": span.rows, "rss_delta": span.rss_delta},
+            }
+            for span in self.spans
+        ]
+
+    def write_trace(self, path: str | Path) -> None:
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.trace_events()}, file, default=str)
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Record the spans of everything run inside the block (and its threads)."""
+    tracer = tracer or Tracer()
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+def span(name: str, **attrs):
+    """Time a phase under the active tracer; a no-op when there is none."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **attrs)
+
+
+def traced_call(func: Callable, *args, **kwargs) -> Tuple[Any, List[Span]]:
+    """
+    Run ``func`` under a fresh tracer and return its result with the spans,
+    for process pool workers, which do not see the parent's tracer. perf
+    counters are system-wide on Linux, so the spans line up with the parent's.
+    """
+    with tracing() as tracer:
+        return func(*args, **kwargs), tracer.spans
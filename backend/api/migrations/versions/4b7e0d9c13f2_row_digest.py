@@ -0,0 +1,108 @@
+"""row digest
+
+Revision ID: 4b7e0d9c13f2
+Revises: e81f4c2a9d36
+Create Date: 2026-10-17 13:40:05.912633
+
+"""
+from datetime import datetime
+import hashlib
+from numbers import Real
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e0d9c13f2'
+down_revision: Union[str, None] = 'e81f4c2a9d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# the content fields each table's digest covers at this revision, in
+# declaration order (app.utils.digest.digest_fields)
+DIGEST_FIELDS = {
+    'average_daily_population': [
+        'incomplete', 'started', 'range', 'timestamp', 'agency', 'criminality', 'population',
+    ],
+    'average_stay_length': [
+        'incomplete', 'started', 'range', 'timestamp', 'agency', 'criminality', 'length_of_stay',
+    ],
+    'book_in': ['incomplete', 'started', 'range', 'timestamp', 'agency', 'bookings'],
+    'book_out_release': [
+        'incomplete', 'started', 'range', 'timestamp', 'reason', 'criminality', 'releases',
+    ],
+    'facilities': [
+        'name', 'address', 'city', 'state', 'zip_code', 'aor', 'type_detailed', 'gender',
+        'fy25_alos', 'level_a', 'level_b', 'level_c', 'level_d', 'male_crim',
+        'male_non_crim', 'female_crim', 'female_non_crim', 'ice_threat_level_1',
+        'ice_threat_level_2', 'ice_threat_level_3', 'no_ice_threat_level', 'mandatory',
+        'guaranteed_minimum', 'last_inspection_type', 'last_inspection_end_date',
+        'pending_fy25_inspection', 'last_inspection_standard', 'last_final_rating',
+    ],
+}
+BATCH_SIZE = 5000
+
+
+# the digest as app.utils.digest computed it at this revision
+def canonical(value) -> str:
+    if value is None:
+        return '\x00'
+    if isinstance(value, bool):
+        return 'T' if value else 'F'
+    if isinstance(value, Real):
+        return repr(float(value))
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat()
+    return str(value)
+
+
+def row_digest(values) -> str:
+    text = '\x1f'.join(map(canonical, values))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def backfill(table_name: str, fields: list[str]) -> None:
+    """Digest the existing rows in batches of ids, as imports would have."""
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id'),
+        sa.column('row_digest'),
+        *(sa.column(name) for name in fields),
+    )
+    query = (
+        sa.select(table.c.id, *(table.c[name] for name in fields))
+        .where(table.c.id > sa.bindparam('last_id'))
+        .order_by(table.c.id)
+        .limit(BATCH_SIZE)
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values(row_digest=sa.bindparam('digest'))
+    )
+    last_id = 0
+    while rows := bind.execute(query, {'last_id': last_id}).all():
+        bind.execute(
+            update,
+            [{'row_id': row[0], 'digest': row_digest(row[1:])} for row in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    for table_name, fields in DIGEST_FIELDS.items():
+        op.add_column(
+            table_name,
+            sa.Column('row_digest', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True),
+        )
+        backfill(table_name, fields)
+
+
+def downgrade() -> None:
+    for table_name in DIGEST_FIELDS:
+        op.drop_column(table_name, 'row_digest')
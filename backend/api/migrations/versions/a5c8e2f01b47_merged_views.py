@@ -0,0 +1,62 @@
+"""merged views
+
+Revision ID: a5c8e2f01b47
+Revises: 4b7e0d9c13f2
+Create Date: 2026-10-17 15:21:48.203716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c8e2f01b47'
+down_revision: Union[str, None] = '4b7e0d9c13f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table: (natural key, monthly data), as in app/services/reports.py
+VIEWS = {
+    'average_daily_population': (['timestamp', 'agency', 'criminality'], True),
+    'average_stay_length': (['timestamp', 'agency', 'criminality'], True),
+    'book_in': (['timestamp', 'agency'], True),
+    'book_out_release': (['timestamp', 'reason', 'criminality'], True),
+    'facilities': (['name'], False),
+}
+
+
+def view_sql(table: str, keys: list[str], monthly: bool) -> str:
+    partition = ', '.join(f't."{key}"' for key in keys)
+    where = (
+        "WHERE t.incomplete = false AND t.started = true AND t.range = 'month'"
+        if monthly
+        else ''
+    )
+    return f"""
+        CREATE MATERIALIZED VIEW merged_{table} AS
+        SELECT id FROM (
+            SELECT t.id, row_number() OVER (
+                PARTITION BY {partition}
+                ORDER BY r.publication_date DESC, r.id DESC
+            ) AS rn
+            FROM {table} t JOIN detention_stats_reports r ON t.report_id = r.id
+            {where}
+        ) ranked
+        WHERE rn = 1
+    """
+
+
+def upgrade() -> None:
+    for table, (keys, monthly) in VIEWS.items():
+        op.execute(view_sql(table, keys, monthly))
+        # a unique index lets imports refresh the view CONCURRENTLY
+        op.create_index(f'ix_merged_{table}_id', f'merged_{table}', ['id'], unique=True)
+
+
+def downgrade() -> None:
+    for table in VIEWS:
+        op.execute(f'DROP MATERIALIZED VIEW merged_{table}')
@@ -0,0 +1,49 @@
+"""confirmed report id
+
+Revision ID: c3d9a1e27b54
+Revises: 5a69e4ac22fa
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a1e27b54'
+down_revision: Union[str, None] = '5a69e4ac22fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = [
+    'average_daily_population',
+    'average_stay_length',
+    'book_in',
+    'book_out_release',
+    'facilities',
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('confirmed_report_id', sa.Integer(), nullable=True))
+        op.create_index(op.f(f'ix_{table}_confirmed_report_id'), table, ['confirmed_report_id'], unique=False)
+        op.create_foreign_key(
+            op.f(f'{table}_confirmed_report_id_fkey'),
+            table,
+            'detention_stats_reports',
+            ['confirmed_report_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_constraint(op.f(f'{table}_confirmed_report_id_fkey'), table, type_='foreignkey')
+        op.drop_index(op.f(f'ix_{table}_confirmed_report_id'), table_name=table)
+        op.drop_column(table, 'confirmed_report_id')
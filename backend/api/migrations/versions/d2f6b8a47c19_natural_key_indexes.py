@@ -0,0 +1,38 @@
+"""natural key indexes
+
+Revision ID: d2f6b8a47c19
+Revises: a5c8e2f01b47
+Create Date: 2026-10-17 16:48:33.127509
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8a47c19'
+down_revision: Union[str, None] = 'a5c8e2f01b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    'average_daily_population': ['timestamp', 'agency', 'criminality', 'report_id'],
+    'average_stay_length': ['timestamp', 'agency', 'criminality', 'report_id'],
+    'book_in': ['timestamp', 'agency', 'report_id'],
+    'book_out_release': ['timestamp', 'reason', 'criminality', 'report_id'],
+    'facilities': ['name', 'report_id'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in INDEXES.items():
+        op.create_index(f'ix_{table}_natural_key', table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for table in INDEXES:
+        op.drop_index(f'ix_{table}_natural_key', table_name=table)
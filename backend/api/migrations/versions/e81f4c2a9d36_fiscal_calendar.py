@@ -0,0 +1,72 @@
+"""fiscal calendar
+
+Revision ID: e81f4c2a9d36
+Revises: c3d9a1e27b54
+Create Date: 2026-10-17 11:02:17.540183
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f4c2a9d36'
+down_revision: Union[str, None] = 'c3d9a1e27b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# imports add the months of newer fiscal years as they arrive
+FIRST_FISCAL_YEAR = 2019
+LAST_FISCAL_YEAR = 2030
+MONTH_ABBRS = ['Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep']
+
+
+def fiscal_months():
+    for fiscal_year in range(FIRST_FISCAL_YEAR, LAST_FISCAL_YEAR + 1):
+        for index, abbr in enumerate(MONTH_ABBRS):
+            month = (index + 9) % 12 + 1
+            year = fiscal_year - 1 if month >= 10 else fiscal_year
+            next_start = datetime(year + month // 12, month % 12 + 1, 1)
+            yield {
+                'fiscal_year': fiscal_year,
+                'fiscal_month': index + 1,
+                'quarter': index // 3 + 1,
+                'month_abbr': abbr,
+                'month_start': datetime(year, month, 1),
+                'month_end': next_start - timedelta(days=1),
+            }
+
+
+def upgrade() -> None:
+    fiscal_calendar = op.create_table('fiscal_calendar',
+    sa.Column('fiscal_year', sa.Integer(), nullable=False),
+    sa.Column('fiscal_month', sa.Integer(), nullable=False),
+    sa.Column('quarter', sa.Integer(), nullable=False),
+    sa.Column('month_abbr', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('month_start', sa.DateTime(), nullable=False),
+    sa.Column('month_end', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fiscal_calendar_fiscal_month'), 'fiscal_calendar', ['fiscal_month'], unique=False)
+    op.create_index(op.f('ix_fiscal_calendar_fiscal_year'), 'fiscal_calendar', ['fiscal_year'], unique=False)
+    op.create_index(op.f('ix_fiscal_calendar_month_abbr'), 'fiscal_calendar', ['month_abbr'], unique=False)
+    op.create_index(op.f('ix_fiscal_calendar_month_end'), 'fiscal_calendar', ['month_end'], unique=True)
+    op.create_index(op.f('ix_fiscal_calendar_month_start'), 'fiscal_calendar', ['month_start'], unique=False)
+    op.create_index(op.f('ix_fiscal_calendar_quarter'), 'fiscal_calendar', ['quarter'], unique=False)
+    op.bulk_insert(fiscal_calendar, list(fiscal_months()))
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fiscal_calendar_quarter'), table_name='fiscal_calendar')
+    op.drop_index(op.f('ix_fiscal_calendar_month_start'), table_name='fiscal_calendar')
+    op.drop_index(op.f('ix_fiscal_calendar_month_end'), table_name='fiscal_calendar')
+    op.drop_index(op.f('ix_fiscal_calendar_month_abbr'), table_name='fiscal_calendar')
+    op.drop_index(op.f('ix_fiscal_calendar_fiscal_year'), table_name='fiscal_calendar')
+    op.drop_index(op.f('ix_fiscal_calendar_fiscal_month'), table_name='fiscal_calendar')
+    op.drop_table('fiscal_calendar')
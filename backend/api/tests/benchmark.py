@@ -0,0 +1,185 @@
+"""
+Offline benchmark for the Excel extraction and loader pipeline.
+
+Times ``extract_tables``, ``convert_to_df_dict`` and every loader's ``rows``
+(and its ORM ``load``) on each workbook in ``app/files/data``, reporting wall time, peak memory and
+rows per second. Results can be saved as a JSON baseline and later runs fail
+when a stage gets slower (or hungrier) than the baseline allows.
+
+    cd api
+    python -m tests.benchmark --save              # record a baseline
+    python -m tests.benchmark                     # compare against it
+    python -m tests.benchmark --threshold 0.5 --engine xml
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from app.loaders import get_loaders
+from app.scripts.import_data import build_report
+from app.services.excel import convert_to_df_dict, extract_tables
+from tests.test_excel import GOLD_REPORT, GOLD_SHEET, check_gold_tables
+
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "files" / "data"
+DEFAULT_BASELINE = Path(".cache/benchmark.json")
+
+
+def measure(func: Callable[[], Any], repeat: int) -> tuple[Any, float, int]:
+    """(result, best wall time in seconds, peak traced bytes)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    # tracing slows the hot loops down, so memory gets its own run
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def count_rows(tables: dict) -> int:
+    total = 0
+    for table in tables.values():
+        if isinstance(table, dict):
+            total += len(next(iter(table.values()), []))
+        else:
+            total += len(table)
+    return total
+
+
+def run(engine: str, repeat: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+
+    def record(name: str, seconds: float, peak: int, rows: int):
+        results[name] = {
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "rows": rows,
+            "rows_per_second": rows / seconds if seconds else 0.0,
+        }
+
+    for file_path in sorted(DATA_DIR.glob("*.xlsx")):
+        report = build_report(str(file_path), b"")
+        loaders = get_loaders(report.fiscal_year)
+        sheets = {
+            (loader.sheet_name, tuple(loader.sheet_skip_rows or ())) for loader in loaders
+        }
+        data = {}
+        for sheet_name, skip_rows in sorted(sheets):
+            prefix = f"{file_path.name}/{sheet_name}"
+            tables, seconds, peak = measure(
+                lambda: extract_tables(
+                    file_path,
+                    sheet_name,
+                    sheet_skip_rows=list(skip_rows) or None,
+                    use_cache=False,
+                    engine=engine,
+                ),
+                repeat,
+            )
+            rows = count_rows(tables)
+            record(f"{prefix}/extract_tables", seconds, peak, rows)
+
+            frames, seconds, peak = measure(lambda: convert_to_df_dict(tables), repeat)
+            record(f"{prefix}/convert_to_df_dict", seconds, peak, rows)
+            data[(sheet_name, skip_rows)] = frames
+
+        for loader in loaders:
+            df = data[(loader.sheet_name, tuple(loader.sheet_skip_rows or ()))][
+                loader.title
+            ]
+            batch, seconds, peak = measure(lambda: loader.rows(df, report), repeat)
+            record(f"{file_path.name}/load/{loader.name}", seconds, peak, len(batch))
+            # the ORM compatibility path, for comparison
+            items, seconds, peak = measure(lambda: loader.load(df, report), repeat)
+            record(f"{file_path.name}/load_orm/{loader.name}", seconds, peak, len(items))
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    min_seconds: float,
+) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        limit = previous["seconds"] * (1 + threshold)
+        if current["seconds"] > max(limit, min_seconds):
+            regressions.append(
+                f"{name}: {current['seconds'] * 1000:.1f}ms vs baseline "
+                f"{previous['seconds'] * 1000:.1f}ms"
+            )
+        if current["peak_bytes"] > previous["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{name}: peak {current['peak_bytes'] / 1e6:.1f}MB vs baseline "
+                f"{previous['peak_bytes'] / 1e6:.1f}MB"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write a new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown / memory growth over the baseline, 0.25 = 25%%",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.005,
+        help="never flag stages faster than this (timer noise)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engine", choices=["openpyxl", "xml"], default="openpyxl")
+    args = parser.parse_args()
+
+    errors = check_gold_tables(
+        extract_tables(GOLD_REPORT, GOLD_SHEET, use_cache=False, engine=args.engine)
+    )
+    for error in errors:
+        print(f"GOLD {error}")
+
+    results = run(args.engine, args.repeat)
+    print(f"{'stage':<90} {'ms':>9} {'peak MB':>8} {'rows/s':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:<90} {r['seconds'] * 1000:>9.1f} "
+            f"{r['peak_bytes'] / 1e6:>8.1f} {r['rows_per_second']:>11,.0f}"
+        )
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        errors.extend(regressions)
+    else:
+        print(f"No baseline at {args.baseline}, run with --save to record one")
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
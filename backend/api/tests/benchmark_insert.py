@@ -0,0 +1,101 @@
+"""
+Insert throughput of each ingestion mode against a real PostgreSQL.
+
+Loads the bundled reports' rows once, then writes them with every insert
+mode ("copy", "core", "orm") inside a transaction that is rolled back, so
+the database is left as it was. Needs the DATABASE_* settings of a migrated
+database.
+
+    cd api
+    python -m tests.benchmark_insert
+    python -m tests.benchmark_insert --modes copy orm --repeat 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.db import async_session, engine
+from app.loaders import RowBatch, get_loaders
+from app.scripts.import_data import build_report, extract_report, table_requests
+from app.services.excel import convert_to_df_dict
+from app.services.ingest import INSERT_MODES, insert_batch
+
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "files" / "data"
+
+
+def load_batches(file_path: Path) -> list[RowBatch]:
+    report = build_report(file_path, b"")
+    loaders = get_loaders(report.fiscal_year)
+    data = {
+        source: convert_to_df_dict(tables)
+        for source, tables in zip(table_requests(loaders), extract_report(file_path))
+    }
+    return [
+        loader.rows(
+            data[(loader.sheet_name, tuple(loader.sheet_skip_rows or ()))][loader.title],
+            report,
+        )
+        for loader in loaders
+    ]
+
+
+async def insert_all(reports: list[tuple[Path, list[RowBatch]]], mode: str) -> float:
+    """Seconds to write every batch in ``mode``; the transaction is rolled back."""
+    async with async_session() as session:
+        try:
+            started = time.perf_counter()
+            for file_path, batches in reports:
+                report = build_report(file_path, b"")
+                session.add(report)
+                for batch in batches:
+                    await insert_batch(session, batch, report, mode)
+                await session.flush()
+            seconds = time.perf_counter() - started
+
+            # check every row made it before throwing them away
+            for batch in batches:
+                table = batch.model.__table__
+                count = await session.scalar(
+                    select(func.count()).where(table.c.report_id == report.id)
+                )
+                assert count == len(batch), f"{table.name}: {count} != {len(batch)}"
+        finally:
+            await session.rollback()
+    return seconds
+
+
+async def run(modes: list[str], repeat: int) -> None:
+    reports = [(path, load_batches(path)) for path in sorted(DATA_DIR.glob("*.xlsx"))]
+    rows = sum(len(batch) for _, batches in reports for batch in batches)
+    print(f"{len(reports)} reports, {rows} rows")
+
+    results = {}
+    for mode in modes:
+        results[mode] = min([await insert_all(reports, mode) for _ in range(repeat)])
+    slowest = max(results.values())
+    print(f"{'mode':<6} {'ms':>9} {'rows/s':>11} {'speedup':>8}")
+    for mode, seconds in results.items():
+        print(
+            f"{mode:<6} {seconds * 1000:>9.1f} {rows / seconds:>11,.0f} "
+            f"{slowest / seconds:>7.1f}x"
+        )
+    await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", choices=INSERT_MODES, default=INSERT_MODES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.modes, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Query time of each merged_* strategy as the number of loaded reports grows.
+
+Copies of the bundled reports' rows are inserted as synthetic reports, one
+publication day apart, up to each size (10, 100 and 1000 reports by
+default, on top of what the database holds). At each size the tables are
+analysed and every strategy ("window", "distinct", "lateral", and "view"
+after a refresh) is timed per dataset. Everything runs in one transaction
+that is rolled back. Needs the DATABASE_* settings of a migrated database.
+
+    cd api
+    python -m tests.benchmark_merged
+    python -m tests.benchmark_merged --sizes 10 100 --drop_indexes
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import async_session, engine
+from app.scripts.import_data import build_report
+from app.services.ingest import insert_batch
+from app.services.reports import (
+    MERGED_STRATEGIES,
+    MERGED_VIEWS,
+    merged_current_query,
+    refresh_merged_views,
+)
+from tests.benchmark_insert import DATA_DIR, load_batches
+
+
+async def add_reports(session: AsyncSession, reports: list, start: int, end: int) -> None:
+    """Insert synthetic reports ``start`` to ``end`` - 1."""
+    for index in range(start, end):
+        file_path, batches = reports[index % len(reports)]
+        report = build_report(file_path, b"")
+        report.source_name = f"benchmark_{index}"
+        report.publication_date += timedelta(days=index)
+        session.add(report)
+        for batch in batches:
+            await insert_batch(session, batch, report, "copy")
+        await session.flush()
+
+
+async def time_query(session: AsyncSession, query, repeat: int) -> float:
+    """Best of ``repeat`` runs of counting the rows of ``query``, in seconds."""
+    count = select(func.count()).select_from(query.subquery())
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await session.scalar(count)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def run(sizes: list[int], repeat: int, drop_indexes: bool) -> None:
+    reports = [(path, load_batches(path)) for path in sorted(DATA_DIR.glob("*.xlsx"))]
+    strategies = [s for s in MERGED_STRATEGIES if s != "view"] + ["view"]
+    print(f"{'reports':>7} {'dataset':<24}" + "".join(f"{s:>10}" for s in strategies))
+    async with async_session() as session:
+        try:
+            connection = await session.connection()
+            if drop_indexes:
+                for model in MERGED_VIEWS:
+                    await connection.exec_driver_sql(
+                        f"DROP INDEX ix_{model.__tablename__}_natural_key"
+                    )
+            loaded = 0
+            for size in sorted(sizes):
+                await add_reports(session, reports, loaded, size)
+                loaded = size
+                for model in MERGED_VIEWS:
+                    await connection.exec_driver_sql(f"ANALYZE {model.__tablename__}")
+                await connection.exec_driver_sql("ANALYZE detention_stats_reports")
+                started = time.perf_counter()
+                await refresh_merged_views(session)
+                refresh = time.perf_counter() - started
+
+                for model in MERGED_VIEWS:
+                    cells = []
+                    for strategy in strategies:
+                        query = merged_current_query(model, strategy)
+                        seconds = await time_query(session, query, repeat)
+                        cells.append(f"{seconds * 1000:>8.1f}ms")
+                    print(f"{size:>7} {model.__tablename__:<24}" + "".join(cells))
+                print(f"{size:>7} {'(view refresh)':<24}{refresh * 1000:>8.1f}ms")
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--drop_indexes",
+        action="store_true",
+        help="time without the natural key indexes (dropped in the transaction)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeat, args.drop_indexes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
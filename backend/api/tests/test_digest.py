@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from app.models import AverageDailyPopulation, BookIn
+from app.utils.digest import model_digests, row_digests, same_digest, stamp_digests
+
+
+def test_digest_survives_database_round_trip():
+    columns = {
+        "timestamp": [datetime(2025, 1, 31)],
+        "agency": ["ICE"],
+        "criminality": ["Total"],
+        "population": [3],
+        "incomplete": [False],
+        "started": [True],
+        "range": ["month"],
+    }
+    # a float column reads back as float, a timestamp may come with a timezone
+    read_back = AverageDailyPopulation(
+        **{name: values[0] for name, values in columns.items()}, report_id=1
+    )
+    read_back.population = 3.0
+    read_back.timestamp = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    assert row_digests(AverageDailyPopulation, columns) == model_digests([read_back])
+
+
+def test_stamped_digests_detect_changes():
+    def booking(bookings):
+        return BookIn(
+            timestamp=datetime(2025, 1, 31), agency="ICE", bookings=bookings, report_id=1
+        )
+
+    old, same, changed = booking(10), booking(10), booking(11)
+    stamp_digests([old, same, changed])
+    assert same_digest(same, old)
+    assert not same_digest(changed, old)
+    assert not same_digest(booking(10), old)
@@ -0,0 +1,200 @@
+import numpy as np
+from openpyxl.worksheet.merge import CellRange
+
+from app.services.excel import (
+    SheetGrid,
+    _typed_column,
+    WorkbookSession,
+    extract_grid_tables,
+    extract_tables,
+)
+from app.services.table_cache import TableCache
+
+
+gold_tables = [
+    {
+        "title": "ICE Currently Detained by Processing Disposition and Detention Facility Type: FY2025",
+        "columns": 4,
+        "rows": 5,
+    },
+    {
+        "title": "Average Time from USCIS Fear Decision Service Date to ICE Release (In Days)",
+        "columns": 4,
+        "rows": 1,
+    },
+    {
+        "title": "Aliens with USCIS-Established Fear Decisions in an ICE Detention Facility by Facility Type",
+        "columns": 2,
+        "rows": 3,
+    },
+    {
+        "title": "ICE Currently Detained by Criminality and Arresting Agency: FY2025",
+        "columns": 6,
+        "rows": 4,
+    },
+    {
+        "title": "ICE Initial Book-Ins by Arresting Agency and Month: FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "ICE Initial Book-Ins by Facility Type and Criminality: FY2025",
+        "columns": 5,
+        "rows": 3,
+    },
+    {"title": "ICE Final Book Outs by Facility Type: FY2025", "columns": 2, "rows": 3},
+    {"title": "ICE Removals: FY2025", "columns": 2, "rows": 2},
+    {
+        "title": "ICE Final Book Outs by Release Reason, Month and Criminality: FY2025",
+        "columns": 15,
+        "rows": 49,
+    },
+    {
+        "title": "ICE Average Daily Population by Arresting Agency, Month and Criminality: FY2025",
+        "columns": 14,
+        "rows": 12,
+    },
+    {
+        "title": "ICE Average Length of Stay by Arresting Agency, Month and Criminality: FY2025",
+        "columns": 14,
+        "rows": 12,
+    },
+    {
+        "title": "ICE Average Daily Population by Facility Type and Month: FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "ICE Average Length of Stay by Facility Type and Month: FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "ICE Average Length of Stay Adult Facility Type by Month and Arresting Agency: FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "ICE Average Length of Stay Adult Facility Type by Month and Arresting Agency: FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "Aliens with Positive Credible Fear Determination Parole Requested: FY2023 - FY2025",
+        "columns": 14,
+        "rows": 3,
+    },
+    {
+        "title": "Aliens with Positive Credible Fear Determination Parole Status: FY2023 - FY2025",
+        "columns": 15,
+        "rows": 6,
+    },
+    {
+        "title": "ICE Currently Detained of Stateless Aliens by Detention Facility",
+        "columns": 3,
+        "rows": 30,
+    },
+]
+
+
+GOLD_REPORT = "app/files/data/FY25_detentionStats06202025.xlsx"
+GOLD_SHEET = "Detention FY25"
+
+
+def check_gold_tables(tables: dict) -> list[str]:
+    """Mismatches between extracted tables and the gold titles and shapes."""
+    errors = []
+    for gold in gold_tables:
+        title = gold["title"]
+        if title not in tables:
+            errors.append(f"missing table: {title}")
+            continue
+        found = tables[title]
+        if len(found) != gold["rows"]:
+            errors.append(
+                f"rows mismatch: expected {gold['rows']} vs actual {len(found)} for {title}"
+            )
+        found_cols = len(found[0].keys()) if found else 0
+        if found_cols != gold["columns"]:
+            errors.append(
+                f"columns mismatch: expected {gold['columns']} vs actual {found_cols} for {title}"
+            )
+    return errors
+
+
+def test_excel():
+    tables = extract_tables(GOLD_REPORT, sheet_name=GOLD_SHEET, use_cache=False)
+
+    assert check_gold_tables(tables) == []
+
+
+def test_excel_titles():
+    titles = {g["title"] for g in gold_tables}
+    tables = extract_tables(
+        GOLD_REPORT, sheet_name=GOLD_SHEET, titles=titles, use_cache=False
+    )
+
+    assert set(tables) == titles
+    assert check_gold_tables(tables) == []
+
+
+def test_cached_titles_use_targeted_extraction(tmp_path):
+    titles = [g["title"] for g in gold_tables[:2]]
+    cache = TableCache(tmp_path)
+    with WorkbookSession(GOLD_REPORT, cache=cache) as session:
+        tables = session.extract_tables(GOLD_SHEET, titles=titles)
+    # only the requested tables are extracted and stored
+    assert set(tables) == set(titles)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    with WorkbookSession(GOLD_REPORT, cache=cache) as session:
+        assert session.extract_tables(GOLD_SHEET, titles=titles) == tables
+        assert session._wb is None
+
+
+def test_skipped_rows_move_merges_with_their_row():
+    rows = [
+        ["notes", None, None, None],
+        [],
+        ["T", None, None, None],
+        ["h1", None, "h2", None],
+        [1, None, 2, None],
+    ]
+    # h1 spans A4:B4, so the header block runs on to h2
+    grid = SheetGrid(rows, [CellRange("A4:B4")])
+
+    assert extract_grid_tables(grid) == {"T": [{"h1": 1, "h2": 2}]}
+    # hiding row 1 moves the merge up with its cells; openpyxl's delete_rows
+    # left it on row 4 (now the data row), splitting the headers
+    assert extract_grid_tables(grid.masked([1])) == {"T": [{"h1": 1, "h2": 2}]}
+
+
+def test_masked_views_reuse_their_masks():
+    with WorkbookSession(GOLD_REPORT) as session:
+        grid = session.grid(GOLD_SHEET)
+        view = grid.masked([3, 1])
+
+        assert grid.masked([1, 3]) is view
+        assert view.mask(52) is grid.masked([1, 3]).mask(52)
+
+
+def test_typed_columns_match_cell_coercion():
+    def typed(values):
+        column = _typed_column(values)
+        if isinstance(column, np.ndarray):
+            return column.dtype.name, column.tolist()
+        return "object", column
+
+    # whole numbers stay exact, also past float64's 2**53
+    assert typed([2**60 + 1, 1]) == ("int64", [2**60 + 1, 1])
+    assert typed([str(2**60 + 1), 2.0]) == ("int64", [2**60 + 1, 2])
+    # thousands separators, signs and padding in numeric text
+    assert typed(["1,234", " +3 ", "-7"]) == ("int64", [1234, 3, -7])
+    # exponents and blanks make a float column, as they would a DataFrame's
+    assert typed(["+3", "1e3"]) == ("float64", [3.0, 1000.0])
+    assert typed(["1,234", None, ""])[0] == "float64"
+    assert typed([1.5, 2]) == ("float64", [1.5, 2.0])
+    # anything else is coerced cell by cell
+    assert typed([1, "x", "2"]) == ("object", [1, "x", 2])
+    assert typed([2**70, 1]) == ("object", [2**70, 1])
+    assert typed(["", None]) == ("object", [None, None])
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.excel import WorkbookSession
+
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "files" / "data"
+REPORTS = sorted(DATA_DIR.glob("*.xlsx"))
+
+
+@pytest.mark.parametrize("file_path", REPORTS, ids=lambda p: p.name)
+def test_xml_engine_matches_openpyxl(file_path: Path):
+    with (
+        WorkbookSession(file_path) as expected,
+        WorkbookSession(file_path, engine="xml") as actual,
+    ):
+        assert actual.sheet_names == expected.sheet_names
+        for sheet_name in expected.sheet_names:
+            skip_rows = [1, 2, 3, 5, 6] if sheet_name.startswith("Facilities") else None
+            assert actual.extract_tables(
+                sheet_name, sheet_skip_rows=skip_rows
+            ) == expected.extract_tables(sheet_name, sheet_skip_rows=skip_rows)
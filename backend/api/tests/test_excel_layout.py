@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.excel import (
+    EXTRACTOR_VERSION,
+    SheetGrid,
+    WorkbookSession,
+    extract_grid_tables,
+    extract_layout_tables,
+)
+from app.services.table_layout import LayoutStore
+
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "files" / "data"
+REPORTS = sorted(DATA_DIR.glob("FY25_*.xlsx"))
+SHEET = "Detention FY25"
+
+
+@pytest.mark.parametrize("file_path", REPORTS[1:], ids=lambda p: p.name)
+def test_learned_layout_matches_full_scan(tmp_path: Path, file_path: Path):
+    layouts = LayoutStore(tmp_path)
+    with WorkbookSession(REPORTS[0], layouts=layouts) as first:
+        first.extract_tables(SHEET)
+    entry = (SHEET, (), "AZ")
+    learned = layouts.get(EXTRACTOR_VERSION, entry)
+    assert learned
+
+    with (
+        WorkbookSession(file_path) as expected,
+        WorkbookSession(file_path, layouts=layouts) as actual,
+    ):
+        assert actual.extract_tables(SHEET) == expected.extract_tables(SHEET)
+        titles = list(expected.extract_tables(SHEET))[-3:]
+        assert actual.extract_tables(SHEET, titles=titles) == expected.extract_tables(
+            SHEET, titles=titles
+        )
+
+
+def test_stale_layout_falls_back_to_full_scan(tmp_path: Path):
+    layouts = LayoutStore(tmp_path)
+    entry = (SHEET, (), "AZ")
+    with WorkbookSession(REPORTS[0], layouts=layouts) as session:
+        session.extract_tables(SHEET)
+    layout = layouts.get(EXTRACTOR_VERSION, entry)
+    # pretend the first table moved down a row
+    layout[0]["gap"] += 1
+    layouts.put(EXTRACTOR_VERSION, entry, layout)
+
+    with (
+        WorkbookSession(REPORTS[0]) as expected,
+        WorkbookSession(REPORTS[0], layouts=layouts) as actual,
+    ):
+        assert actual.extract_tables(SHEET) == expected.extract_tables(SHEET)
+    # and the layout is learned again
+    assert layouts.get(EXTRACTOR_VERSION, entry)[0]["gap"] == layout[0]["gap"] - 1
+
+
+def test_table_added_on_known_row_falls_back_to_full_scan():
+    def grid(rows):
+        return SheetGrid([list(r) for r in rows], [])
+
+    before = [
+        ["A", None, None, None, None],
+        ["h1", "h2", None, None, None],
+        [1, 2, None, None, None],
+    ]
+    after = [
+        ["A", None, None, "B", None],
+        ["h1", "h2", None, "k", None],
+        [1, 2, None, 9, None],
+    ]
+    layout: list = []
+    extract_grid_tables(grid(before), layout=layout)
+
+    assert extract_layout_tables(grid(after), layout) is None
+    assert list(extract_grid_tables(grid(after))) == ["A", "B"]
+
+
+def test_titled_layout_records_whole_title_row():
+    rows = [
+        ["A", None, None, "B", None],
+        ["h1", "h2", None, "k", None],
+        [1, 2, None, 9, None],
+    ]
+    grid = SheetGrid(rows, [])
+    layout: list = []
+    tables = extract_grid_tables(grid, titles={"A"}, layout=layout)
+
+    assert list(tables) == ["A"]
+    assert [anchor["key"] for anchor in layout[0]["tables"]] == ["A", "B"]
+    assert extract_layout_tables(grid, layout, titles={"A"}) == tables
+
+
+def test_titled_scan_keeps_full_layout(tmp_path: Path):
+    layouts = LayoutStore(tmp_path)
+    entry = (SHEET, (), "AZ")
+    with WorkbookSession(REPORTS[0], layouts=layouts) as session:
+        titles = list(session.extract_tables(SHEET))[:1]
+    full = layouts.get(EXTRACTOR_VERSION, entry)
+
+    # a stale full layout makes the titled read scan, without replacing it
+    stale = [{**full[0], "gap": full[0]["gap"] + 1}, *full[1:]]
+    layouts.put(EXTRACTOR_VERSION, entry, stale)
+    with WorkbookSession(REPORTS[0], layouts=layouts) as session:
+        session.extract_tables(SHEET, titles=titles)
+    assert layouts.get(EXTRACTOR_VERSION, entry) == stale
+    assert layouts.get(EXTRACTOR_VERSION, (*entry, tuple(titles)))
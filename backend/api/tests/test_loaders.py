@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pandas as pd
+
+from app.loaders import AverageDailyPopulationLoader, BookInLoader
+from app.scripts.import_data import build_report
+from app.services.fiscal_calendar import fiscal_months, fiscal_year_of
+
+
+def test_rows_match_previous_loader_values():
+    report = build_report("FY25_detentionStats02142025.xlsx", b"")
+    df = pd.DataFrame(
+        {
+            "Agency": ["Average", "ICE Average", "Convicted Criminal"],
+            "Jan": [10.123, 4.5, 1.0],
+            "Feb": [11.0, 5.555, 2.0],
+            "FY Overall": [10.5, 5.0, 1.5],
+        }
+    )
+    batch = AverageDailyPopulationLoader("FY2025").rows(df, report)
+    fields = ["timestamp", "agency", "criminality", "population", "incomplete"]
+    records = list(zip(*(batch.columns[name] for name in fields)))
+
+    # as the row-by-row loader built them before RowBatch
+    jan, pub_date = datetime(2025, 1, 31), report.publication_date
+    assert records == [
+        (jan, "Average", "Average", 10.12, False),
+        (pub_date, "Average", "Average", 11.0, True),
+        (pub_date, "Average", "Average", 10.5, False),
+        (jan, "ICE", "Average", 4.5, False),
+        (pub_date, "ICE", "Average", 5.55, True),
+        (pub_date, "ICE", "Average", 5.0, False),
+        (jan, "ICE", "Convicted Criminal", 1.0, False),
+        (pub_date, "ICE", "Convicted Criminal", 2.0, True),
+        (pub_date, "ICE", "Convicted Criminal", 1.5, False),
+    ]
+    assert batch.columns["range"] == ["month", "month", "fy"] * 3
+    assert all(batch.columns["started"])
+
+
+def test_month_flags_follow_publication_month():
+    report = build_report("FY25_detentionStats02142025.xlsx", b"")
+    df = pd.DataFrame(
+        {
+            "Agency": ["CBP", "ICE"],
+            "Jan": [1, 2],
+            "Feb": [3, None],
+            "Mar": [None, 4],
+            "Total": [4, 6],
+        }
+    )
+    batch = BookInLoader("FY2025").rows(df, report)
+    cells = list(
+        zip(
+            batch.columns["timestamp"],
+            batch.columns["bookings"],
+            batch.columns["incomplete"],
+            batch.columns["started"],
+            batch.columns["range"],
+        )
+    )
+    pub_date = report.publication_date
+    assert cells[:4] == [
+        (datetime(2025, 1, 31), 1, False, True, "month"),
+        (pub_date, 3, True, True, "month"),
+        (datetime(2025, 3, 31), 0, True, False, "month"),
+        (pub_date, 4, False, True, "fy"),
+    ]
+    assert cells[4:] == [
+        (datetime(2025, 1, 31), 2, False, True, "month"),
+        (pub_date, 0, True, True, "month"),
+        (datetime(2025, 3, 31), 4, True, False, "month"),
+        (pub_date, 6, False, True, "fy"),
+    ]
+    assert batch.columns["agency"] == ["CBP"] * 4 + ["ICE"] * 4
+
+
+def test_fiscal_calendar_months():
+    months = list(fiscal_months(2024).values())
+    assert [m.month_abbr for m in months[:4]] == ["Oct", "Nov", "Dec", "Jan"]
+    assert months[0].month_start == datetime(2023, 10, 1)
+    assert months[4].month_end == datetime(2024, 2, 29)
+    assert [m.quarter for m in months] == [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4]
+    assert fiscal_year_of(datetime(2024, 10, 1)) == 2025
+    assert fiscal_months(2024) is fiscal_months(2024)
@@ -0,0 +1,189 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import BookIn
+from app.utils.digest import stamp_digests
+from app.utils.sync import (
+    _upsert_columns,
+    _upsert_sql,
+    stream_sort_key,
+    stream_table,
+    sync_db,
+    sync_db_stream,
+)
+
+
+SKIP_FIELDS = {"id", "uuid", "created_at"}
+
+
+class StubSession:
+    """Records what the syncs add and flush, without a database."""
+
+    def __init__(self):
+        self.flushes: list[list] = []
+        self.pending: list = []
+        self.committed = False
+
+    def add_all(self, rows):
+        self.pending.extend(rows)
+
+    async def flush(self):
+        self.flushes.append(self.pending)
+        self.pending = []
+
+    async def commit(self):
+        self.committed = True
+
+
+async def _stream(rows):
+    for row in rows:
+        yield row
+
+
+def booking(agency, bookings, month=1):
+    return BookIn(
+        timestamp=datetime(2025, month, 28),
+        agency=agency,
+        bookings=bookings,
+        report_id=1,
+    )
+
+
+def key(row):
+    return (row.agency, row.timestamp)
+
+
+def sync(external, db, batch_size=2):
+    # rows read from the database carry the digest they were written with
+    stamp_digests(db)
+    session = StubSession()
+    external = sorted(external, key=lambda row: stream_sort_key(key(row)))
+    db = sorted(db, key=lambda row: stream_sort_key(key(row)))
+    result = asyncio.run(
+        sync_db_stream(
+            session,
+            _stream(external),
+            _stream(db),
+            key,
+            skip_fields=SKIP_FIELDS,
+            batch_size=batch_size,
+        )
+    )
+    assert session.committed
+    return result, session.flushes
+
+
+def test_interleaved_inserts_and_updates_across_chunks():
+    db = [booking("CBP", 1), booking("ICE", 2), booking("USBP", 3)]
+    external = [
+        booking("Adams", 10),
+        booking("CBP", 1),
+        booking("ICE", 20),
+        booking("OFO", 30),
+        booking("USBP", 3),
+        booking("Zeta", 40),
+    ]
+    (inserted, updated), flushes = sync(external, db)
+
+    assert (inserted, updated) == (3, 1)
+    # chunks of two external rows, each flushing its own changes
+    assert [[(row.agency, row.bookings) for row in f] for f in flushes] == [
+        [("Adams", 10)],
+        [("ICE", 20), ("OFO", 30)],
+        [("Zeta", 40)],
+    ]
+    # updates go to the database row
+    assert flushes[1][0] is db[1]
+
+
+def test_repeated_external_key_updates_the_insert():
+    external = [booking("ICE", 1), booking("ICE", 2)]
+    (inserted, updated), flushes = sync(external, [], batch_size=1)
+
+    assert (inserted, updated) == (1, 1)
+    assert flushes[0][0] is flushes[1][0]
+    assert flushes[0][0].bookings == 2
+
+
+def test_text_keys_follow_code_point_order_and_nulls_first():
+    # "ADELANTO" < "Adams" by code point, the reverse of en_US collation
+    db = [booking("Adams", 1), booking("ADELANTO", 2), booking(None, 3)]
+    external = [booking(None, 3), booking("ADELANTO", 2), booking("Adams", 5)]
+    (inserted, updated), _ = sync(external, db)
+
+    assert (inserted, updated) == (0, 1)
+
+
+def test_stream_table_orders_like_stream_sort_key():
+    captured = {}
+
+    class Session:
+        async def stream_scalars(self, query):
+            captured["query"] = query
+            return _stream([])
+
+    async def read():
+        async for _ in stream_table(Session(), BookIn, ["agency", "timestamp"]):
+            pass
+
+    asyncio.run(read())
+    dialect = postgresql.dialect()
+    assert [
+        str(term.compile(dialect=dialect))
+        for term in captured["query"]._order_by_clauses
+    ] == [
+        'book_in.agency COLLATE "C" ASC NULLS FIRST',
+        "book_in.timestamp ASC NULLS FIRST",
+    ]
+
+
+def test_unsorted_rows_are_rejected():
+    session = StubSession()
+    external = [booking("ICE", 1), booking("CBP", 2)]
+    with pytest.raises(ValueError, match="external rows sorted"):
+        asyncio.run(sync_db_stream(session, _stream(external), _stream([]), key))
+
+
+def test_upsert_keeps_created_at_and_updates_on_report_change():
+    keys = ["timestamp", "agency"]
+    values, updated = _upsert_columns(BookIn, keys, set())
+    assert "created_at" in values and "created_at" not in updated
+    sql = " ".join(
+        _upsert_sql("book_in", "sync_book_in", keys, values, [], updated).split()
+    )
+
+    assert '"created_at" = EXCLUDED' not in sql
+    assert '"report_id" = EXCLUDED."report_id"' in sql
+    # the digest leaves out report_id, so it is compared on its own
+    assert (
+        'WHERE (t."report_id", t."confirmed_report_id", t."row_digest") '
+        'IS DISTINCT FROM (EXCLUDED."report_id", EXCLUDED."confirmed_report_id", '
+        'EXCLUDED."row_digest")'
+    ) in sql
+    assert 'ON CONFLICT ("timestamp", "agency") DO UPDATE SET' in sql
+
+
+def test_report_only_change_is_synced():
+    old = booking("ICE", 1)
+    stamp_digests([old])
+    new = booking("ICE", 1)
+    new.report_id = 2
+    session = StubSession()
+    asyncio.run(sync_db(session, [new], [old], key, skip_fields=SKIP_FIELDS))
+
+    assert session.pending == [old]
+    assert old.report_id == 2
+
+
+def test_report_only_change_is_streamed():
+    old = booking("ICE", 1)
+    new = booking("ICE", 1)
+    new.report_id = 2
+    (inserted, updated), flushes = sync([new], [old])
+
+    assert (inserted, updated) == (0, 1)
+    assert flushes == [[old]]
+    assert old.report_id == 2
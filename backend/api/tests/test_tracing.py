@@ -0,0 +1,24 @@
+from app.services.excel import convert_to_df_dict, extract_tables
+from app.utils.tracing import span, tracing
+from tests.test_excel import GOLD_REPORT, GOLD_SHEET
+
+
+def test_extraction_phases_are_traced():
+    with tracing() as tracer:
+        tables = extract_tables(GOLD_REPORT, GOLD_SHEET, use_cache=False)
+        frames = convert_to_df_dict(tables)
+
+    phases = tracer.summary()["phases"]
+    for name in ("workbook_open", "sheet_read", "merge_map", "detect", "read_table"):
+        assert phases[name]["count"] >= 1
+    assert phases["read_table"]["count"] == len(tables)
+    assert phases["to_dataframe"]["rows"] == sum(len(df) for df in frames.values())
+    assert all(event["ph"] == "X" for event in tracer.trace_events())
+
+
+def test_span_is_a_no_op_without_tracer():
+    with span("detect") as s:
+        s.rows = 10
+    with tracing() as tracer:
+        pass
+    assert tracer.spans == []